@@ -0,0 +1,303 @@
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from engine import Game
+from geometry import center_bonus, neighbor_counts, padded_neighbor_table, parity_table
+from placements import FLEET_SIZES, random_fleets
+
+# Hücre durum kodları
+UNKNOWN, MISS, HIT, SUNK = 0, 1, 2, 3
+
+CENTER_BONUS = center_bonus(10)
+PARITY = parity_table(10) == 1
+
+
+def fleet_boards(num_games, rng=None):
+    """(num_games, 100) int8 gemi kimlikleri: 0 su, k ise filodaki k. gemi"""
+    return random_fleets(num_games, FLEET_SIZES, rng)
+
+
+def fleets_from_players(players):
+    """engine.Player filolarını toplu simülatörün dizi biçimine çevirir"""
+    rows = []
+    for player in players:
+        fleet = np.zeros(100, dtype=np.int8)
+        for ship_id, ship in enumerate(player.ships, start=1):
+            fleet[ship.indexes] = ship_id
+        rows.append(fleet)
+    return np.array(rows, dtype=np.int8).reshape(-1, 100)
+
+
+# (100, 4) komşu tablosu; eksik komşular 100 numaralı dolgu sütununa gider
+NEIGHBOR_TABLE = padded_neighbor_table(10)
+
+
+class Policy:
+    """Per-game policy state for a batch of N games.
+
+    ``choose`` returns one cell per row; ``update`` is told about the
+    shots just applied to the rows still in play, and ``compact`` drops
+    finished rows. Row-level state lives in (N, 101) arrays whose last
+    column absorbs the padding entries of NEIGHBOR_TABLE.
+    """
+
+    def __init__(self, num_games, rng):
+        self.rng = rng
+
+    def choose(self, state, step):
+        raise NotImplementedError
+
+    def update(self, rows, cells, hit, state, sunk_rows, sunk_cells):
+        pass
+
+    def compact(self, keep):
+        pass
+
+
+class RandomPolicy(Policy):
+    """Rastgele atış = her oyun için önceden karıştırılmış bir atış sırası"""
+
+    def __init__(self, num_games, rng):
+        super().__init__(num_games, rng)
+        self.order = rng.permuted(np.tile(np.arange(100, dtype=np.int8), (num_games, 1)), axis=1)
+
+    def choose(self, state, step):
+        return self.order[:, step]
+
+    def compact(self, keep):
+        self.order = self.order[keep]
+
+
+class GreedyPolicy(Policy):
+    """Game'in greedy AI'sıyla aynı skor: merkez + parite + 3*H - 2*M komşuları"""
+
+    def __init__(self, num_games, rng):
+        super().__init__(num_games, rng)
+        base = np.append(CENTER_BONUS + 0.5 * PARITY, -np.inf).astype(np.float32)
+        self.scores = np.tile(base, (num_games, 1))
+
+    def choose(self, state, step):
+        return self.scores.argmax(axis=1)
+
+    def update(self, rows, cells, hit, state, sunk_rows, sunk_cells):
+        # Satır başına komşular benzersizdir; yalnızca dolgu sütunu tekrarlanır
+        neighbors = NEIGHBOR_TABLE[cells]
+        self.scores[rows[:, None], neighbors] += np.where(hit, 3, -2).astype(np.float32)[:, None]
+        self.scores[rows, cells] = -np.inf
+        if len(sunk_rows):
+            # Batan geminin kareleri artık "H" değil, komşu bonusları geri alınır
+            counts = neighbor_counts(sunk_cells, 10)
+            self.scores[sunk_rows, :100] -= 3 * counts
+        self.scores[:, 100] = -np.inf
+
+    def compact(self, keep):
+        self.scores = self.scores[keep]
+
+
+class ParityPolicy(Policy):
+    """Hunt/target: isabetlerin boş komşularına, yoksa parite karelerine rastgele ateş eder"""
+
+    def __init__(self, num_games, rng):
+        super().__init__(num_games, rng)
+        keys = rng.random((num_games, 100)) + np.where(PARITY, 0, 1)
+        self.hunt_order = keys.argsort(axis=1).astype(np.int8)
+        self.pointer = np.zeros(num_games, dtype=np.int64)
+        self.targets = np.zeros((num_games, 101), dtype=bool)
+
+    def choose(self, state, step):
+        rows = np.arange(len(state))
+        # Av sırasında zaten atılmış kareleri atla
+        while True:
+            pending = self.pointer < 100
+            cells = self.hunt_order[rows, np.minimum(self.pointer, 99)]
+            shot = pending & (state[rows, cells] != UNKNOWN)
+            if not shot.any():
+                break
+            self.pointer[shot] += 1
+
+        targeting = self.targets.any(axis=1)
+        if targeting.any():
+            keys = self.rng.random((int(targeting.sum()), 101))
+            keys[~self.targets[targeting]] = -1
+            cells = cells.copy()
+            cells[targeting] = keys.argmax(axis=1)
+        return cells
+
+    def update(self, rows, cells, hit, state, sunk_rows, sunk_cells):
+        self.targets[rows, cells] = False
+        hit_rows, hit_cells = rows[hit], cells[hit]
+        neighbors = NEIGHBOR_TABLE[hit_cells]
+        unknown = np.append(state[hit_rows] == UNKNOWN, np.zeros((len(hit_rows), 1), dtype=bool), axis=1)
+        self.targets[hit_rows[:, None], neighbors] |= unknown[np.arange(len(hit_rows))[:, None], neighbors]
+        if len(sunk_rows):
+            open_cells = state[sunk_rows] == UNKNOWN
+            self.targets[sunk_rows, :100] = open_cells & (neighbor_counts(state[sunk_rows] == HIT, 10) > 0)
+        self.targets[:, 100] = False
+
+    def compact(self, keep):
+        self.hunt_order = self.hunt_order[keep]
+        self.pointer = self.pointer[keep]
+        self.targets = self.targets[keep]
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'greedy': GreedyPolicy,
+    'parity': ParityPolicy,
+}
+
+
+def shots_to_finish(policy, fleets, rng):
+    """Advances one shooter per game in lock-step until every fleet is sunk.
+
+    ``policy`` is a name from POLICIES. Returns an (N,) array with the
+    number of shots each game needed. The two sides of a Battleship game
+    never influence each other's boards, so a full game is two
+    independent runs of this (see ``play_batch``). Finished games are
+    compacted away once a quarter of the rows are done.
+    """
+    num_games = len(fleets)
+    sizes = np.array((0,) + FLEET_SIZES)
+    shooter = POLICIES[policy](num_games, rng)
+    fleets = np.asarray(fleets)
+    state = np.zeros((num_games, 100), dtype=np.int8)
+    ship_hits = np.zeros((num_games, len(sizes)), dtype=np.int8)
+    remaining = (fleets != 0).sum(axis=1)
+    game_ids = np.arange(num_games)
+    alive = np.ones(num_games, dtype=bool)
+    shots = np.zeros(num_games, dtype=np.int32)
+
+    for step in range(100):
+        cells = shooter.choose(state, step)
+        rows = np.flatnonzero(alive)
+        cells = cells[rows]
+        ship_ids = fleets[rows, cells]
+        hit = ship_ids > 0
+        state[rows, cells] = np.where(hit, HIT, MISS)
+
+        hit_rows, hit_ids = rows[hit], ship_ids[hit]
+        ship_hits[hit_rows, hit_ids] += 1
+        remaining[hit_rows] -= 1
+
+        sunk = ship_hits[hit_rows, hit_ids] == sizes[hit_ids]
+        sunk_rows = hit_rows[sunk]
+        sunk_cells = fleets[sunk_rows] == hit_ids[sunk][:, None]
+        if len(sunk_rows):
+            state[sunk_rows] = np.where(sunk_cells, SUNK, state[sunk_rows])
+        shooter.update(rows, cells, hit, state, sunk_rows, sunk_cells)
+
+        done = rows[remaining[rows] == 0]
+        if len(done):
+            shots[game_ids[done]] = step + 1
+            alive[done] = False
+        if not alive.any():
+            break
+        if alive.sum() < 0.75 * len(alive):
+            keep = np.flatnonzero(alive)
+            state, fleets, ship_hits, remaining = state[keep], fleets[keep], ship_hits[keep], remaining[keep]
+            game_ids, alive = game_ids[keep], alive[keep]
+            shooter.compact(keep)
+
+    return shots
+
+
+def play_batch(policy1, policy2, num_games, rng=None, chunk_size=100_000):
+    """N oyunu toplu oynar; Game ile aynı kurallar (1. oyuncu önce atar)"""
+    rng = rng or np.random.default_rng()
+    shots1, shots2 = [], []
+    for start in range(0, num_games, chunk_size):
+        size = min(chunk_size, num_games - start)
+        shots1.append(shots_to_finish(policy1, fleet_boards(size, rng), rng))
+        shots2.append(shots_to_finish(policy2, fleet_boards(size, rng), rng))
+    return game_outcomes(np.concatenate(shots1), np.concatenate(shots2))
+
+
+def game_outcomes(shots1, shots2):
+    """Her iki tarafın bitirme atışlarından kazananı ve toplam hamleyi hesaplar"""
+    first_wins = shots1 <= shots2
+    moves = np.where(first_wins, 2 * shots1 - 1, 2 * shots2)
+    return {'first_wins': first_wins, 'moves': moves, 'shots1': shots1, 'shots2': shots2}
+
+
+def wilson_interval(wins, games, z=1.96):
+    """Kazanma oranı için Wilson güven aralığı"""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denom
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return center - half, center + half
+
+
+def check_against_scalar(num_games=300, seed=0):
+    """Compares the batch simulator with engine.Game.
+
+    Greedy is deterministic given a fleet, so batch and scalar shot counts
+    must match exactly on the same fleets. For random play the mean
+    shots-to-finish of both implementations are compared with a
+    two-sample z-test.
+    """
+    game_rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    report = {}
+
+    for policy in ('greedy', 'random'):
+        players, scalar = [], []
+        for _ in range(num_games):
+            game = Game(False, False, ai_type=policy, ai_type2=policy, rng=game_rng)
+            shots = 0
+            while not game.check_game_over():
+                game.make_move(*game.decide().move)
+                game.player1_turn = True  # Yalnızca 1. oyuncunun atışlarını say
+                shots += 1
+            players.append(game.player2)
+            scalar.append(shots)
+
+        scalar = np.array(scalar)
+        batch = shots_to_finish(policy, fleets_from_players(players), rng)
+        if policy == 'greedy':
+            report['greedy_exact_match'] = bool((scalar == batch).all())
+        else:
+            fresh = shots_to_finish(policy, fleet_boards(num_games, rng), rng)
+            se = math.sqrt(scalar.var(ddof=1) / len(scalar) + fresh.var(ddof=1) / len(fresh))
+            report['random_scalar_mean'] = float(scalar.mean())
+            report['random_batch_mean'] = float(fresh.mean())
+            report['random_z'] = float((scalar.mean() - fresh.mean()) / se)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy toplu Battleship simülatörü")
+    parser.add_argument('--games', type=int, default=100_000, help="eşleşme başına oyun sayısı")
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true', help="engine.Game ile istatistiksel karşılaştırma yap")
+    args = parser.parse_args()
+
+    if args.check:
+        for key, value in check_against_scalar(seed=args.seed).items():
+            print(f"{key}: {value}")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    for policy1 in args.policies:
+        for policy2 in args.policies:
+            if policy1 < policy2:
+                start = time.perf_counter()
+                outcome = play_batch(policy1, policy2, args.games, rng)
+                elapsed = time.perf_counter() - start
+                wins = int(outcome['first_wins'].sum())
+                low, high = wilson_interval(wins, args.games)
+                print(f"{policy1} vs {policy2}: win rate {wins / args.games:.2%} "
+                      f"[{low:.2%}, {high:.2%}], avg moves {outcome['moves'].mean():.2f}, "
+                      f"{args.games / elapsed:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,742 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from engine import Game, Player
+from placements import probability_density
+from rules import DEFAULT_RULES, Rules
+from simulation import AI_TYPES, MatchSummary, StopRule, play_game, stop_reason, tournament_pairings
+from strategies import STRATEGIES, generate_simple_board, greedy_scores
+
+
+def bench_moves(num_games=1000, repeat=5, seed=0):
+    """Random atış dizileriyle Game.make_move hızını ölçer (hamle/saniye)"""
+    best = None
+    for _ in range(repeat):
+        rng = random.Random(seed)
+        games = [Game(False, False, rng=rng) for _ in range(num_games)]
+        orders = [(rng.sample(range(100), 100), rng.sample(range(100), 100))
+                  for _ in range(num_games)]
+
+        moves = 0
+        start = time.perf_counter()
+        for game, (order1, order2) in zip(games, orders):
+            shots1, shots2 = iter(order1), iter(order2)
+            while not game.over:
+                cell = next(shots1) if game.player1_turn else next(shots2)
+                game.make_move(cell // 10, cell % 10)
+                moves += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {'moves': moves, 'seconds': best, 'moves_per_second': moves / best}
+
+
+def bench_ai_moves(num_games=50, seed=0, ai_types=("random", "bfs", "greedy", "probability")):
+    """Her AI tipi için tam AI hamlesi (karar + make_move) hızı (hamle/saniye)"""
+    result = {}
+    for ai_type in ai_types:
+        rng = random.Random(seed)
+        games = [Game(False, False, ai_type=ai_type, ai_type2=ai_type, rng=rng) for _ in range(num_games)]
+        moves = 0
+        start = time.perf_counter()
+        for game in games:
+            while not game.over:
+                game.ai_move()
+                moves += 1
+        result[f'{ai_type}_moves_per_second'] = moves / (time.perf_counter() - start)
+    return result
+
+
+def board_corpus(num_boards=50, seed=0):
+    """Rastgele oyunlardan ara tahta durumları üretir: (game, shooter, target) listesi"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(num_boards):
+        game = Game(False, False, rng=rng)
+        for _ in range(rng.randint(10, 60)):
+            if game.over:
+                break
+            game.ai_move()
+        game.player1_turn = True
+        corpus.append((game, game.player1, game.player2))
+    return corpus
+
+
+def bench_density_error(num_boards=50, num_simulations=100, seed=0):
+    """Monte Carlo örneklemesini kesin yerleşim yoğunluğuyla karşılaştırır.
+
+    Both estimates are normalised over the open cells of each board; the
+    error is the mean total variation distance between them.
+    """
+    corpus = board_corpus(num_boards, seed)
+    sampled_time = exact_time = 0.0
+    distances = []
+
+    for game, shooter, target in corpus:
+        search = shooter.search.tolist()
+        open_cells = np.array(search) == "U"
+        sizes = game.remaining_ship_sizes(target)
+
+        start = time.perf_counter()
+        sampled = np.zeros(100)
+        for _ in range(num_simulations):
+            sampled += np.array(game.generate_simple_board(search, list(sizes)))
+        sampled_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = probability_density(shooter.search, sizes).flatten()
+        exact_time += time.perf_counter() - start
+
+        sampled = np.where(open_cells, sampled, 0)
+        if sampled.sum() == 0 or exact.sum() == 0:
+            continue
+        distances.append(0.5 * np.abs(sampled / sampled.sum() - exact / exact.sum()).sum())
+
+    return {
+        'boards': len(distances),
+        'sampled_us_per_move': sampled_time / num_boards * 1e6,
+        'exact_us_per_move': exact_time / num_boards * 1e6,
+        'mean_tv_distance': float(np.mean(distances)),
+        'max_tv_distance': float(np.max(distances)),
+    }
+
+
+def hunt_corpus(num_boards=20, seed=0):
+    """Yalnızca ıskalar içeren tahtalar: Monte Carlo her hamlede örnekleme yapar"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(num_boards):
+        game = Game(False, False, rng=rng)
+        water = [i for i in range(100) if not game.player2.fleet >> i & 1]
+        for i in rng.sample(water, rng.randint(5, 40)):
+            game.player1.search[i] = "M"
+        corpus.append((game, game.player1, game.player2))
+    return corpus
+
+
+def bench_heatmap_latency(num_boards=20, seed=0):
+    """monte_carlo_ai hamle gecikmesi: heatmap dinleyicisi olmadan ve varken (ms)"""
+    corpus = hunt_corpus(num_boards, seed)
+    timings = {}
+    for label, render in (('headless', False), ('rendered', True)):
+        elapsed = 0.0
+        for game, _, _ in corpus:
+            if render:
+                game.add_score_listener(game.create_heatmap)
+            game.rng.seed(seed)
+            start = time.perf_counter()
+            game.monte_carlo_ai()
+            elapsed += time.perf_counter() - start
+            if render:
+                game.remove_score_listener(game.create_heatmap)
+        timings[f'{label}_ms_per_move'] = elapsed / num_boards * 1e3
+    return timings
+
+
+def scaling_corpus(board_size, num_boards=3, miss_fraction=0.3, seed=0):
+    """board_size kenarlı tahtalar; suyun miss_fraction kadarı ıskalanmış, vuruş yok"""
+    rng = random.Random(seed)
+    rules = Rules(board_size, DEFAULT_RULES.fleet)
+    corpus = []
+    for _ in range(num_boards):
+        game = Game(False, False, rules=rules, rng=rng)
+        water = [i for i in range(rules.cells) if not game.player2.fleet >> i & 1]
+        for cell in rng.sample(water, int(len(water) * miss_fraction)):
+            game.player1_turn = True
+            game.make_move(*divmod(cell, board_size))
+        game.player1_turn = True
+        corpus.append(game)
+    return corpus
+
+
+def bench_scaling(sizes=(10, 20, 50, 100), num_boards=3, seed=0,
+                  ai_types=("random", "bfs", "greedy", "probability", "monte_carlo")):
+    """Her AI tipinin karar süresinin tahta boyuyla nasıl büyüdüğünü ölçer (ms/hamle).
+
+    Each AI decides on the same hunt-phase boards (misses only, so no AI
+    can shortcut through a hit frontier) at every size, with the default
+    fleet. ``<ai>_exponent`` is the slope of log(time) against
+    log(cells), so 1 means the decision cost grows linearly with the
+    number of cells.
+    """
+    timings = {ai_type: [] for ai_type in ai_types}
+    for board_size in sizes:
+        corpus = scaling_corpus(board_size, num_boards, seed=seed)
+        for ai_type in ai_types:
+            elapsed = 0.0
+            corpus[0].ai_type = ai_type
+            corpus[0].decide()  # Önbelleğe alınan tablolar ölçülmez
+            for game in corpus:
+                game.ai_type = ai_type
+                game.current_strategy()  # Strateji kurulumu ölçülmez
+                game.rng.seed(seed)
+                start = time.perf_counter()
+                game.decide()
+                elapsed += time.perf_counter() - start
+            timings[ai_type].append(elapsed / num_boards)
+
+    result = {}
+    cells = np.log([board_size * board_size for board_size in sizes])
+    for ai_type, seconds in timings.items():
+        for board_size, value in zip(sizes, seconds):
+            result[f'{ai_type}_{board_size}_ms_per_move'] = value * 1e3
+        if len(sizes) > 1:
+            result[f'{ai_type}_exponent'] = float(np.polyfit(cells, np.log(seconds), 1)[0])
+    return result
+
+
+# Bu modüllerden birini içe aktarmak aşağıdaki ağır kütüphaneleri yüklememeli
+STARTUP_MODULES = ("engine", "simulation", "report", "gui")
+HEAVY_MODULES = ("matplotlib", "seaborn", "scipy", "pandas", "sklearn", "networkx", "tkinter", "PIL")
+
+
+def import_profile(module):
+    """Runs ``import module`` under ``python -X importtime`` in a fresh interpreter.
+
+    Returns the module's cumulative import time in milliseconds and the
+    set of top-level packages the import loaded. pygame gets a dummy video
+    driver so that gui can be imported headless. Raises RuntimeError if the
+    import fails.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                             capture_output=True, text=True, env=env,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    if process.returncode != 0:
+        errors = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"import {module} failed: {errors[-1] if errors else process.returncode}")
+    cumulative_us = None
+    packages = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        packages.add(name.strip().split(".")[0])
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1e3, packages
+
+
+def bench_startup(repeat=5, modules=STARTUP_MODULES):
+    """Her modülün soğuk içe aktarma süresi (ms, en iyi deneme) ve yüklenen ağır kütüphane sayısı"""
+    result = {}
+    for module in modules:
+        timings = []
+        for _ in range(repeat):
+            milliseconds, packages = import_profile(module)
+            timings.append(milliseconds)
+        result[f'{module}_import_ms'] = min(timings)
+        result[f'{module}_heavy_modules'] = len(packages.intersection(HEAVY_MODULES))
+    return result
+
+
+def check_startup(modules=STARTUP_MODULES):
+    """Import-time regression check: no startup module may load a HEAVY_MODULES package.
+
+    Returns a list of failure messages (empty when the check passes).
+    """
+    failures = []
+    for module in modules:
+        try:
+            _, packages = import_profile(module)
+        except RuntimeError as error:
+            failures.append(str(error))
+            continue
+        heavy = sorted(packages.intersection(HEAVY_MODULES))
+        if heavy:
+            failures.append(f"import {module} loads {', '.join(heavy)}")
+    return failures
+
+
+def reference_greedy_scores(board, rules=DEFAULT_RULES):
+    """The per-cell greedy scoring loop that greedy_scores replaced, kept as its oracle"""
+    size = rules.size
+    neighbors = [[r * size + c for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+                  if 0 <= r < size and 0 <= c < size]
+                 for row in range(size) for col in range(size)]
+    scores = np.zeros(size * size)
+    for i in range(size * size):
+        row, col = divmod(i, size)
+        center_dist = abs(row - rules.center) + abs(col - rules.center)
+        scores[i] = (size - 1 - center_dist) / 2 + (0.5 if (row + col) % 2 == 0 else 0)
+    for i in range(size * size):
+        if board[i] == "H":
+            scores[neighbors[i]] += 3
+        elif board[i] == "M":
+            scores[neighbors[i]] -= 2
+    return scores
+
+
+def reference_evaluate_position(game, row, col):
+    """Game.evaluate_position'ın get_neighbors döngüsüyle yazılmış eski hali"""
+    current = game.player1 if game.player1_turn else game.player2
+    search = current.search.tolist()
+    size = game.rules.size
+    score = 0
+    for r, c in game.get_neighbors(row, col):
+        val = search[r * size + c]
+        if val == "H":
+            score += 2
+        elif val == "M":
+            score -= 1
+    center_dist = abs(row - game.rules.center) + abs(col - game.rules.center)
+    score += (size - 1 - center_dist) / 2
+    return score
+
+
+def check_greedy_kernel(num_games=10, seed=0, sizes=(10, 7)):
+    """Exact-match check of the vectorized greedy kernel against the per-cell loops.
+
+    Greedy games are played on each board size; after every move the
+    kernel, the greedy strategy's incrementally updated scores and
+    Game.evaluate_positions (plus one evaluate_position cell) are compared
+    with the reference loops using exact equality. Returns a list of failure messages (empty when the
+    check passes).
+    """
+    rng = random.Random(seed)
+    failures = []
+    for size in sizes:
+        rules = Rules(size, [ship for ship in DEFAULT_RULES.fleet if ship <= size])
+        for game_index in range(num_games):
+            game = Game(False, False, ai_type="greedy", ai_type2="greedy", rules=rules, rng=rng)
+            while not game.over and not failures:
+                game.ai_move()
+                board = game.player1.search
+                expected = reference_greedy_scores(board, rules)
+                if not np.array_equal(greedy_scores(board, size), expected):
+                    failures.append(f"{size}x{size} game {game_index}: greedy_scores differs")
+                elif not np.array_equal(game.strategy1.scores, expected):
+                    failures.append(f"{size}x{size} game {game_index}: incremental greedy scores differ")
+                player1_turn = game.player1_turn
+                game.player1_turn = True
+                expected = [[reference_evaluate_position(game, row, col) for col in range(size)] for row in range(size)]
+                row, col = rng.randrange(size), rng.randrange(size)
+                if not np.array_equal(game.evaluate_positions(), expected) or \
+                        game.evaluate_position(row, col) != expected[row][col]:
+                    failures.append(f"{size}x{size} game {game_index}: evaluate_position differs")
+                game.player1_turn = player1_turn
+    return failures
+
+
+def check_paired_interval(max_pairs=200, rule=StopRule("ci")):
+    """Eşli güven aralığı kontrolü: ai1'in her çifti kazandığı bir eşleşme.
+
+    After every pair the paired interval must lie in [0, 1] with nonzero
+    width, and the "ci" rule must not stop the match on it before it would
+    stop the same games without pairing. Returns a list of failure
+    messages (empty when the check passes).
+    """
+    match = MatchSummary("greedy", "random")
+    failures = []
+    for game in range(2 * max_pairs):
+        match.add({'game': game, 'swapped': game % 2 == 1, 'winner': "greedy", 'moves': 120, 'hits': 34,
+                   'first_ai_hits': 17, 'first_ai_shots': 60, 'second_ai_hits': 17, 'second_ai_shots': 60,
+                   'first_ai_scores': None, 'second_ai_scores': None,
+                   'first_ai_shots_to_finish': 60, 'second_ai_shots_to_finish': 95})
+        interval = match.paired_interval()
+        if interval is None:
+            continue
+        if interval[1] - interval[0] <= 0:
+            failures.append(f"{game + 1} games: zero-width paired interval {interval}")
+        if not 0 <= interval[0] <= interval[1] <= 1:
+            failures.append(f"{game + 1} games: paired interval {interval} leaves [0, 1]")
+        if stop_reason(rule, match.wins, match.num_games, interval) is not None:
+            if stop_reason(rule, match.wins, match.num_games) is None:
+                failures.append(f"{game + 1} games: paired interval stopped before independent games would")
+            break
+    return failures
+
+
+def bench_greedy_kernel(num_boards=50, seed=0):
+    """Tam tahta greedy skorlaması: eski hücre döngüsü ve vektörel çekirdek (µs/tahta)"""
+    boards = [shooter.search for _, shooter, _ in board_corpus(num_boards, seed)]
+    timings = {}
+    for label, score in (('loop', reference_greedy_scores), ('kernel', lambda board: greedy_scores(board, 10))):
+        start = time.perf_counter()
+        for board in boards:
+            score(board)
+        timings[f'{label}_us_per_board'] = (time.perf_counter() - start) / num_boards * 1e6
+    return timings
+
+
+def bench_allocations(num_games=10, seed=0, ai_types=("random", "bfs", "greedy", "monte_carlo", "probability")):
+    """ai_move başına tracemalloc ile en yüksek geçici bellek (bayt); ayırma sayısı değil, bellek tepesidir"""
+    result = {}
+    for ai_type in ai_types:
+        rng = random.Random(seed)
+        games = [Game(False, False, ai_type=ai_type, ai_type2=ai_type, rng=rng) for _ in range(num_games)]
+        total = moves = 0
+        tracemalloc.start()
+        try:
+            for game in games:
+                while not game.over:
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    game.ai_move()
+                    total += tracemalloc.get_traced_memory()[1] - before
+                    moves += 1
+        finally:
+            tracemalloc.stop()
+        result[f'{ai_type}_peak_bytes_per_move'] = total / moves
+    return result
+
+
+METRICS_FILE = 'ai_metrics.json'
+PROFILE_AI_TYPES = ("random", "bfs", "greedy", "monte_carlo", "probability")
+
+
+def profile_corpus(num_boards=50, seed=0):
+    """Profil tahtaları: yarısı vuruşlu ara durumlar (board_corpus), yarısı yalnızca ıskalı av durumları"""
+    return board_corpus(num_boards - num_boards // 2, seed) + hunt_corpus(num_boards // 2, seed)
+
+
+def profile_ai(ai_type, num_boards=50, repeat=3, seed=0):
+    """Profiles one AI type's decide() over the fixed profile_corpus.
+
+    Each board gets a fresh strategy (built outside the measurement) and
+    is decided ``repeat`` times for wall time, then once more under
+    tracemalloc for the allocation peak and once under cProfile for the
+    function call count. Every decision is seeded from (seed, board,
+    repetition), so runs are repeatable. Peak RSS is the process
+    high-water mark, so run each AI type in a fresh process (see
+    write_metrics) to keep them separate.
+    """
+    import cProfile
+    import pstats
+    import resource
+
+    rss_start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings, allocations, calls = [], [], []
+    for index, (game, shooter, target) in enumerate(profile_corpus(num_boards, seed)):
+        strategy = STRATEGIES[ai_type](game, shooter, target)
+        decision_seed = (seed * num_boards + index) * (repeat + 2)
+        for rep in range(repeat):
+            game.rng.seed(decision_seed + rep)
+            start = time.perf_counter()
+            strategy.decide()
+            timings.append((time.perf_counter() - start) * 1e3)
+
+        game.rng.seed(decision_seed + repeat)
+        tracemalloc.start()
+        try:
+            strategy.decide()
+            allocations.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+        game.rng.seed(decision_seed + repeat + 1)
+        profiler = cProfile.Profile()
+        profiler.runcall(strategy.decide)
+        calls.append(pstats.Stats(profiler).total_calls)
+
+    p50, p90, p99 = np.percentile(timings, [50, 90, 99])
+    return {
+        'time_ms': {'p50': p50, 'p90': p90, 'p99': p99, 'mean': float(np.mean(timings)), 'max': max(timings)},
+        'alloc_bytes': {'mean': float(np.mean(allocations)), 'max': max(allocations)},
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'start_rss_kib': rss_start,
+        'calls_per_move': float(np.mean(calls)),
+        'moves': len(timings),
+    }
+
+
+def write_metrics(filename=METRICS_FILE, ai_types=PROFILE_AI_TYPES, num_boards=50, repeat=3, seed=0):
+    """Profiles every AI type, each in its own fresh process, and writes the metrics JSON read by report.py"""
+    context = multiprocessing.get_context("spawn")
+    metrics = {'corpus': {'num_boards': num_boards, 'repeat': repeat, 'seed': seed}, 'ai': {}}
+    for ai_type in ai_types:
+        with context.Pool(1) as pool:
+            metrics['ai'][ai_type] = pool.apply(profile_ai, (ai_type, num_boards, repeat, seed))
+        timing = metrics['ai'][ai_type]['time_ms']
+        print(f"{ai_type}: p50 {timing['p50']:.3f} ms, p99 {timing['p99']:.3f} ms")
+    with open(filename, 'w') as f:
+        json.dump(metrics, f, indent=4)
+    return metrics
+
+
+BASELINE_FILE = 'benchmark_baseline.json'
+# Oyun evreleri: karar veren oyuncunun o ana kadar attığı atış sayısı
+GAME_STAGES = {'early': 5, 'mid': 25, 'late': 40}
+
+# Bir regresyon ölçümü: setup(seed) ölçülmeyen girdileri kurar, her girdi için run(girdi) ölçülür.
+# run bir sayı döndürürse o kadar işlem sayılır (ör. hamle), yoksa bir. repeatable ölçümler girdiyi
+# değiştirmez; her girdi, bir tur en az MIN_ROUND_SECONDS sürecek kadar art arda çalıştırılır.
+RegressionCase = namedtuple("RegressionCase", ["setup", "run", "rounds", "repeatable"], defaults=(False,))
+MIN_ROUND_SECONDS = 0.02
+
+
+@lru_cache(maxsize=None)
+def stage_corpus(shots, num_boards=10, seed=0):
+    """Evre tahtaları (game, shooter, target): Player 1 probability AI ile en az ``shots`` atış yapmış.
+
+    Each position is taken at the first turn after that with no unsunk
+    hits left: positions come from real play, but always in hunt mode,
+    so every AI takes its full search path rather than the cheap
+    frontier shortcut. Games that end before reaching such a position
+    are dropped. The corpus is cached; callers must not play further
+    moves on it.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    while len(corpus) < num_boards:
+        game = Game(False, False, ai_type="probability", rng=rng)
+        search = game.player1.search
+        while not game.over and (bin(search.shots).count("1") < shots or search.hits):
+            game.player1_turn = True
+            game.ai_move()
+        if not game.over:
+            game.player1_turn = True
+            corpus.append((game, game.player1, game.player2))
+    return corpus
+
+
+def _shot_orders(num_games, seed):
+    rng = random.Random(seed)
+    return [(Game(False, False, rng=rng), rng.sample(range(100), 100), rng.sample(range(100), 100))
+            for _ in range(num_games)]
+
+
+def _play_shot_orders(state):
+    game, order1, order2 = state
+    shots1, shots2 = iter(order1), iter(order2)
+    moves = 0
+    while not game.over:
+        cell = next(shots1) if game.player1_turn else next(shots2)
+        game.make_move(cell // 10, cell % 10)
+        moves += 1
+    return moves
+
+
+def _empty_players(seed):
+    rng = random.Random(seed)
+    return [(Player(DEFAULT_RULES, ships=[]), rng) for _ in range(200)]
+
+
+def _play_seeded(state):
+    ai1, ai2, seed = state
+    play_game(ai1, ai2, rng=random.Random(seed))
+
+
+def _decide_case(ai_type, shots):
+    def setup(seed):
+        strategies = []
+        for game, shooter, target in stage_corpus(shots, seed=seed):
+            game.rng.seed(seed)  # Önbellekteki oyunların RNG'si her turda aynı noktadan başlar
+            strategies.append(STRATEGIES[ai_type](game, shooter, target))
+        return strategies
+    return RegressionCase(setup, lambda strategy: strategy.decide(), 5, repeatable=True)
+
+
+def _simple_board_case(shots):
+    def setup(seed):
+        rng = random.Random(seed)
+        return [(shooter.search.tolist(), list(game.remaining_ship_sizes(target)), game.rules.size, rng)
+                for game, shooter, target in stage_corpus(shots, seed=seed) for _ in range(10)]
+    return RegressionCase(setup, lambda state: generate_simple_board(*state), 5)
+
+
+def regression_cases(ai_types=AI_TYPES):
+    """The regression suite: case name -> RegressionCase, in a fixed order"""
+    cases = {
+        'place_ships': RegressionCase(_empty_players, lambda state: state[0].place_ships(rng=state[1]), 10),
+        'make_move': RegressionCase(lambda seed: _shot_orders(20, seed), _play_shot_orders, 10),
+    }
+    for ai_type in ai_types:
+        for stage, shots in GAME_STAGES.items():
+            cases[f'decide[{ai_type}-{stage}]'] = _decide_case(ai_type, shots)
+    for stage, shots in GAME_STAGES.items():
+        cases[f'generate_simple_board[{stage}]'] = _simple_board_case(shots)
+    for match_key, ai1, ai2 in tournament_pairings(ai_types):
+        cases[f'play_game[{match_key}]'] = RegressionCase(lambda seed, ai1=ai1, ai2=ai2: [(ai1, ai2, seed)],
+                                                          _play_seeded, 3)
+    return cases
+
+
+def time_case(case, seed=0):
+    """Runs ``case.rounds`` rounds and returns per-operation timing statistics in microseconds.
+
+    Every round rebuilds its inputs with ``setup(seed)`` outside the
+    timer, seeding every generator the case draws from, so all rounds do
+    the same work and the spread between them is measurement noise. Repeatable
+    cases are calibrated first, like pytest-benchmark: each input is run
+    as many times in a row as it takes for a round to last at least
+    MIN_ROUND_SECONDS, so microsecond operations are not lost in timer
+    overhead.
+    """
+    number = 1
+    if case.repeatable:
+        start = time.perf_counter()
+        for state in case.setup(seed):
+            case.run(state)
+        number = max(1, int(MIN_ROUND_SECONDS / (time.perf_counter() - start)))
+
+    per_op = []
+    for _ in range(case.rounds):
+        states = case.setup(seed)
+        ops = 0
+        start = time.perf_counter()
+        for state in states:
+            for _ in range(number):
+                count = case.run(state)
+                ops += count if isinstance(count, int) else 1
+        per_op.append((time.perf_counter() - start) / ops * 1e6)
+    return {
+        'min_us': min(per_op),
+        'median_us': float(np.median(per_op)),
+        'mean_us': float(np.mean(per_op)),
+        'stddev_us': float(np.std(per_op)),
+        'rounds': case.rounds,
+        'ops': ops,
+    }
+
+
+def run_suite(match=None, seed=0):
+    """Times every regression case whose name contains ``match`` (all by default)"""
+    results = {}
+    for name, case in regression_cases().items():
+        if match is None or match in name:
+            results[name] = time_case(case, seed)
+    return results
+
+
+def machine_info():
+    """Sürelerin karşılaştırılabilir olduğu ortam: taban çizgisiyle birlikte saklanır"""
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'machine': platform.machine(), 'system': platform.system(), 'cpus': os.cpu_count()}
+
+
+def load_baseline(filename=BASELINE_FILE):
+    if not os.path.exists(filename):
+        return None
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_baseline(results, filename=BASELINE_FILE):
+    """Stores ``results`` as the baseline; cases not in ``results`` keep their old baseline"""
+    baseline = load_baseline(filename) or {'cases': {}}
+    baseline['machine'] = machine_info()
+    baseline['cases'].update(results)
+    with open(filename, 'w') as f:
+        json.dump(baseline, f, indent=4)
+
+
+def compare_to_baseline(results, baseline, threshold=0.25, stat='min_us'):
+    """(name, current, baseline, relative change, status) rows; status is "REGRESSION" above ``threshold``"""
+    rows = []
+    for name, result in results.items():
+        previous = baseline['cases'].get(name) if baseline else None
+        if previous is None:
+            rows.append((name, result[stat], None, None, "new"))
+            continue
+        change = result[stat] / previous[stat] - 1
+        status = "REGRESSION" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append((name, result[stat], previous[stat], change, status))
+    return rows
+
+
+BENCHMARKS = {
+    'moves': bench_moves,
+    'ai_moves': bench_ai_moves,
+    'density_error': bench_density_error,
+    'heatmap_latency': bench_heatmap_latency,
+    'scaling': bench_scaling,
+    'startup': bench_startup,
+    'greedy_kernel': bench_greedy_kernel,
+    'allocations': bench_allocations,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Battleship engine micro-benchmarks")
+    parser.add_argument('names', nargs='*', default=list(BENCHMARKS),
+                        help="benchmarks to run (default: all)")
+    parser.add_argument('--check-imports', action='store_true',
+                        help="fail if importing a startup module loads the scientific stack (-X importtime)")
+    parser.add_argument('--check-greedy', action='store_true',
+                        help="fail if the vectorized greedy kernel differs from the per-cell reference loops")
+    parser.add_argument('--check-paired', action='store_true',
+                        help="fail if a unanimous paired match gets a zero-width interval or stops too early")
+    parser.add_argument('--profile-ai', metavar='METRICS_FILE', nargs='?', const=METRICS_FILE, default=None,
+                        help=f"profile every AI type over a fixed board corpus and write the metrics "
+                             f"report.py draws from (default file: {METRICS_FILE})")
+    parser.add_argument('--suite', action='store_true',
+                        help="run the regression suite and compare it against the baseline "
+                             "(exit status 1 on a regression)")
+    parser.add_argument('--match', default=None, help="only run suite cases whose name contains this text")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f"baseline file (default: {BASELINE_FILE})")
+    parser.add_argument('--save-baseline', action='store_true', help="store this suite run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown that counts as a regression (default: 0.25 = 25%%)")
+    parser.add_argument('--stat', choices=['min', 'median', 'mean'], default='min',
+                        help="timing statistic compared against the baseline (default: min)")
+    args = parser.parse_args()
+
+    if args.suite:
+        results = run_suite(args.match)
+        baseline = load_baseline(args.baseline)
+        if baseline and baseline.get('machine') != machine_info():
+            print(f"note: {args.baseline} was recorded on {baseline.get('machine')}, timings may not compare")
+        rows = compare_to_baseline(results, baseline, args.threshold, f'{args.stat}_us')
+        for name, current, previous, change, status in rows:
+            against = f"{previous:12.2f} us {change:+7.1%}" if previous is not None else " " * 23
+            print(f"{name:42} {current:12.2f} us {against}  {status}")
+        if args.save_baseline:
+            save_baseline(results, args.baseline)
+            print(f"baseline written to {args.baseline}")
+        elif any(status == "REGRESSION" for *_, status in rows):
+            sys.exit(1)
+        return
+
+    if args.profile_ai:
+        write_metrics(args.profile_ai)
+        print(f"metrics written to {args.profile_ai}")
+        return
+
+    if args.check_greedy:
+        failures = check_greedy_kernel()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("greedy kernel: OK")
+        return
+
+    if args.check_paired:
+        failures = check_paired_interval()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("paired interval: OK")
+        return
+
+    if args.check_imports:
+        failures = check_startup()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("startup imports: OK")
+        return
+
+    for name in args.names:
+        result = BENCHMARKS[name]()
+        print(f"{name}: " + ", ".join(
+            f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
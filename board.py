@@ -0,0 +1,91 @@
+def iter_bits(mask):
+    """Bir bit maskesindeki hücre indekslerini küçükten büyüğe döndürür"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Board:
+    """Bitboard game state: one int mask per cell state (100 bits on 10x10).
+
+    Indexing, iteration and ``len`` behave like the old list of
+    "U"/"H"/"M"/"S" strings, so existing callers can keep treating a
+    board as a sequence while the engine works on the masks directly.
+    """
+
+    def __init__(self, num_cells=100):
+        self.num_cells = num_cells
+        self.full_mask = (1 << num_cells) - 1
+        self.hits = 0
+        self.misses = 0
+        self.sunk = 0
+        self._cells = None
+
+    @property
+    def shots(self):
+        return self.hits | self.misses | self.sunk
+
+    @property
+    def open(self):
+        return self.full_mask & ~(self.hits | self.misses | self.sunk)
+
+    def record_hit(self, bit):
+        self.hits |= bit
+        self._cells = None
+
+    def record_miss(self, bit):
+        self.misses |= bit
+        self._cells = None
+
+    def record_sunk(self, mask):
+        self.hits &= ~mask
+        self.sunk |= mask
+        self._cells = None
+
+    def tolist(self):
+        """Tahtayı eski "U"/"H"/"M"/"S" listesi olarak döndürür (önbellekli)"""
+        if self._cells is None:
+            cells = ["U"] * self.num_cells
+            for i in iter_bits(self.hits):
+                cells[i] = "H"
+            for i in iter_bits(self.misses):
+                cells[i] = "M"
+            for i in iter_bits(self.sunk):
+                cells[i] = "S"
+            self._cells = cells
+        return self._cells
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def __setitem__(self, index, value):
+        if not -self.num_cells <= index < self.num_cells:
+            raise IndexError("board index out of range")
+        bit = 1 << (index % self.num_cells)
+        self.hits &= ~bit
+        self.misses &= ~bit
+        self.sunk &= ~bit
+        if value == "H":
+            self.hits |= bit
+        elif value == "M":
+            self.misses |= bit
+        elif value == "S":
+            self.sunk |= bit
+        elif value != "U":
+            raise ValueError(f"unknown cell state: {value!r}")
+        self._cells = None
+
+    def __len__(self):
+        return self.num_cells
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return (self.hits, self.misses, self.sunk) == (other.hits, other.misses, other.sunk)
+        return self.tolist() == list(other)
+
+    def __repr__(self):
+        return f"Board(hits={self.hits:#x}, misses={self.misses:#x}, sunk={self.sunk:#x})"
@@ -1,53 +1,85 @@
 import random
+from collections import namedtuple
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-# Matplotlib ayarları
-plt.ion()  # Interactive modu aç
+from board import Board, iter_bits
+from geometry import neighbor_table, ship_cells
+from instruments import clock
+from placements import random_placement
+from rules import DEFAULT_RULES
+from strategies import STRATEGIES, create_strategy, generate_simple_board, greedy_scores
+
+# Tek bir atışın kaydı: atan oyuncu (1/2), hücre indeksi, sonuç ("M", "H" ya da batıran isabet için "S")
+# ve istenirse kararın skor matrisi
+MoveRecord = namedtuple("MoveRecord", ["shooter", "cell", "result", "scores"], defaults=(None,))
 
 class Ship:
-    def __init__(self, size):
+    def __init__(self, size, row=None, col=None, orientation=None, board_size=10, rng=random):
         self.size = size
-        self.row = random.randint(0, 9)
-        self.col = random.randint(0, 9)
-        self.orientation = random.choice(["h", "v"])
+        self.board_size = board_size
+        self.row = rng.randint(0, board_size - 1) if row is None else row
+        self.col = rng.randint(0, board_size - 1) if col is None else col
+        self.orientation = rng.choice(["h", "v"]) if orientation is None else orientation
         self.hits = 0
         self.indexes = self.compute_indexes()
+        self.mask = ship_cells(size, self.row, self.col, self.orientation, board_size)[1]
 
     def compute_indexes(self):
-        indexes = []
-        for i in range(self.size):
-            r = self.row + (i if self.orientation == "v" else 0)
-            c = self.col + (i if self.orientation == "h" else 0)
-            if r >= 10 or c >= 10:
-                return []
-            indexes.append(r * 10 + c)
-        return indexes
+        return list(ship_cells(self.size, self.row, self.col, self.orientation, self.board_size)[0])
 
     def contains(self, row, col):
-        return (row * 10 + col) in self.indexes
+        return bool(self.mask >> (row * self.board_size + col) & 1)
 
 
 class Player:
-    def __init__(self):
+    def __init__(self, rules=DEFAULT_RULES, ships=None, rng=random):
+        self.rules = rules
         self.ships = []
-        self.search = ["U" for _ in range(100)]
-        self.opponent_board = ["U" for _ in range(100)]
-        self.place_ships()
-
-    def place_ships(self, sizes=[5, 4, 3, 3, 2]):
-        for size in sizes:
-            while True:
-                ship = Ship(size)
-                if ship.indexes and not any(i in sum([s.indexes for s in self.ships], []) for i in ship.indexes):
-                    self.ships.append(ship)
-                    break
+        self.fleet = 0  # Tüm gemilerin kapladığı hücrelerin maskesi
+        self.search = Board(rules.cells)
+        self.opponent_board = Board(rules.cells)
+        if ships is None:
+            self.place_ships(rng=rng)
+        else:
+            self.add_ships(ships)
+
+    def place_ships(self, sizes=None, rng=random):
+        # Her gemi, mevcut filoyla çakışmayan yasal yerleşimlerden düzgün olarak seçilir
+        board_size = self.rules.size
+        for size in self.rules.fleet if sizes is None else sizes:
+            placement = random_placement(size, self.fleet, rng, board_size)
+            if placement is None:
+                raise ValueError(f"no room left for a ship of size {size}")
+            row, col, orientation, _, _ = placement
+            ship = Ship(size, row, col, orientation, board_size)
+            self.ships.append(ship)
+            self.fleet |= ship.mask
+
+    def add_ships(self, layout):
+        """Places ships from (size, row, col, orientation) entries, e.g. a recorded fleet"""
+        for size, row, col, orientation in layout:
+            ship = Ship(size, row, col, orientation, self.rules.size)
+            if not ship.indexes or ship.mask & self.fleet:
+                raise ValueError(f"ship {(size, row, col, orientation)} is off the board or overlaps the fleet")
+            self.ships.append(ship)
+            self.fleet |= ship.mask
+
+    def layout(self):
+        """Filonun add_ships ile yeniden kurulabilen (size, row, col, orientation) listesi"""
+        return [(ship.size, ship.row, ship.col, ship.orientation) for ship in self.ships]
 
 
 class Game:
-    def __init__(self, human1=True, human2=True, ai_type="random", ai_type2="random"):
-        self.player1 = Player()
-        self.player2 = Player()
+    def __init__(self, human1=True, human2=True, ai_type="random", ai_type2="random", debug_heatmap=False,
+                 rules=None, fleets=None, record_scores=False, instruments=None, rng=None):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        # Oyunun tüm rastgeleliği (filolar, AI kararları) bu random.Random uyumlu nesneden gelir;
+        # verilmezse global random'dan tohumlanır, böylece random.seed ile eski kullanım da tekrarlanabilir
+        self.rng = random.Random(random.getrandbits(64)) if rng is None else rng
+        fleets = (None, None) if fleets is None else fleets
+        self.player1 = Player(self.rules, fleets[0], self.rng)
+        self.player2 = Player(self.rules, fleets[1], self.rng)
         self.human1 = human1
         self.human2 = human2
         self.player1_turn = True
@@ -55,32 +87,87 @@ class Game:
         self.result = None
         self.ai_type = ai_type
         self.ai_type2 = ai_type2
-
-    def make_move(self, row, col):
+        # Her atışın MoveRecord kaydı; record_scores ile AI kararlarının skor matrisleri de saklanır
+        self.history = []
+        self.record_scores = record_scores
+        # İsteğe bağlı Instruments: tur bölümlerinin (decide, sample, score, render, apply) süreleri
+        self.instruments = instruments
+        # Rakibin atış tahtası, atan oyuncunun search tahtasının bir görünümüdür
+        self.player1.opponent_board = self.player2.search
+        self.player2.opponent_board = self.player1.search
+        # AI skor matrisi dinleyicileri (ör. GUI rehberi); karar yolu çizim yapmaz
+        self._score_listeners = []
+        if debug_heatmap:
+            self.add_score_listener(self.create_heatmap)
+        # Her oyuncunun durum tutan stratejisi; make_move her atışı bildirir
+        self.strategy1 = create_strategy(ai_type, self, self.player1, self.player2)
+        self.strategy2 = create_strategy(ai_type2, self, self.player2, self.player1)
+
+    def add_score_listener(self, callback):
+        """Bir AI tahtayı her puanladığında çağrılacak callback(score_board, known_board) kaydeder"""
+        self._score_listeners.append(callback)
+
+    def remove_score_listener(self, callback):
+        self._score_listeners.remove(callback)
+
+    def publish_scores(self, score_board, known_board):
+        if not self._score_listeners:
+            return
+        spans = self.instruments
+        start = clock() if spans is not None else 0
+        for callback in self._score_listeners:
+            callback(score_board, known_board)
+        if spans is not None:
+            spans.record("render", start)
+
+    def make_move(self, row, col, scores=None):
         if self.over:
             return False
 
         current_player = self.player1 if self.player1_turn else self.player2
-        target_player = self.player2 if self.player1_turn else self.player1
-        index = row * 10 + col
+        strategy = self.strategy1 if self.player1_turn else self.strategy2
+        index = row * self.rules.size + col
 
-        if current_player.search[index] != "U":
+        if current_player.search.shots & (1 << index):
             return False
 
-        hit = False
-        for ship in target_player.ships:
-            if ship.contains(row, col):
-                hit = True
-                current_player.search[index] = "H"
-                target_player.opponent_board[index] = "H"
-                ship.hits += 1
-                if ship.hits == ship.size:
-                    self.mark_sunken_ship(ship, current_player, target_player)
-                break
-
-        if not hit:
-            current_player.search[index] = "M"
-            target_player.opponent_board[index] = "M"
+        strategy.sync()
+        result, sunk_mask = self._shoot(index, scores)
+        strategy.observe(index, "M" if result == "M" else "H", sunk_mask)
+        return True
+
+    def replay_move(self, record):
+        """Kayıtlı bir MoveRecord'u strateji çalıştırmadan uygular; tahtayla çelişirse ValueError"""
+        shooter = 1 if self.player1_turn else 2
+        current_player = self.player1 if self.player1_turn else self.player2
+        if self.over or record.shooter != shooter or current_player.search.shots & (1 << record.cell):
+            raise ValueError(f"move {tuple(record[:3])} cannot be played in this position")
+        result, _ = self._shoot(record.cell, record.scores)
+        if result != record.result:
+            raise ValueError(f"move {tuple(record[:3])} gave {result!r} on the recorded fleets")
+
+    def _shoot(self, index, scores=None):
+        """Atışı uygular, kaydeder ve sırayı değiştirir; (sonuç, batan geminin maskesi) döndürür"""
+        current_player = self.player1 if self.player1_turn else self.player2
+        target_player = self.player2 if self.player1_turn else self.player1
+        board = current_player.search
+        bit = 1 << index
+
+        sunk_mask = 0
+        if target_player.fleet & bit:
+            board.record_hit(bit)
+            for ship in target_player.ships:
+                if ship.mask & bit:
+                    ship.hits += 1
+                    if ship.hits == ship.size:
+                        self.mark_sunken_ship(ship, current_player, target_player)
+                        sunk_mask = ship.mask
+                    break
+            result = "S" if sunk_mask else "H"
+        else:
+            board.record_miss(bit)
+            result = "M"
+        self.history.append(MoveRecord(1 if self.player1_turn else 2, index, result, scores))
 
         if self.check_game_over():
             self.over = True
@@ -88,193 +175,119 @@ class Game:
         else:
             self.player1_turn = not self.player1_turn
 
-        return True
+        return result, sunk_mask
+
+    def move_log(self):
+        """Oyunun JSON'a hazır kaydı: iki filo ve [atan, hücre, sonuç(, skorlar)] hamleleri"""
+        moves = []
+        for record in self.history:
+            move = [record.shooter, record.cell, record.result]
+            if record.scores is not None:
+                move.append(np.asarray(record.scores).tolist())
+            moves.append(move)
+        return {"ships": [self.player1.layout(), self.player2.layout()], "moves": moves}
 
     def mark_sunken_ship(self, ship, current_player, target_player):
-        for i in range(ship.size):
-            r = ship.row + (i if ship.orientation == "v" else 0)
-            c = ship.col + (i if ship.orientation == "h" else 0)
-            idx = r * 10 + c
-            current_player.search[idx] = "S"
-            target_player.opponent_board[idx] = "S"
+        current_player.search.record_sunk(ship.mask)
+        if target_player.opponent_board is not current_player.search:
+            target_player.opponent_board.record_sunk(ship.mask)
 
     def check_game_over(self):
+        current_player = self.player1 if self.player1_turn else self.player2
         target_player = self.player2 if self.player1_turn else self.player1
-        return all(ship.hits == ship.size for ship in target_player.ships)
-
-    def ai_move(self):
+        return not target_player.fleet & ~current_player.search.sunk
+
+    def current_strategy(self):
+        """Sıradaki oyuncunun stratejisi; ai_type değiştiyse yeniden oluşturulur"""
+        if self.player1_turn:
+            if self.strategy1.name != self.ai_type:
+                self.strategy1 = create_strategy(self.ai_type, self, self.player1, self.player2)
+            return self.strategy1
+        if self.strategy2.name != self.ai_type2:
+            self.strategy2 = create_strategy(self.ai_type2, self, self.player2, self.player1)
+        return self.strategy2
+
+    def decide(self):
+        """Sıradaki AI oyuncunun kararını döndürür (hamle + kullanılan skor matrisi)"""
+        strategy = self.current_strategy()
+        spans = self.instruments
+        if spans is None:
+            strategy.sync()
+            return strategy.decide()
+
+        spans.ai_type = strategy.name
+        start = clock()
+        strategy.sync()
+        decision = strategy.decide()
+        spans.record("decide", start)
+        return decision
+
+    def ai_move(self, decision=None):
+        """Makes the AI move; pass a Decision from decide() to avoid recomputing it"""
         if self.over:
             return False
 
-        ai_type = self.ai_type if self.player1_turn else self.ai_type2
-        if ai_type == "random":
-            move = self.random_ai()
-        elif ai_type == "bfs":
-            move = self.bfs_ai()
-
-        elif ai_type == "monte_carlo":
-            move = self.monte_carlo_ai()
-        elif ai_type == "greedy":
-            move = self.greedy_ai()
-        else:
-            move = self.random_ai()
-
-        return self.make_move(*move)
+        if decision is None:
+            decision = self.decide()
+
+        scores = decision.scores if self.record_scores else None
+        spans = self.instruments
+        if spans is None:
+            return self.make_move(*decision.move, scores=scores)
+
+        ai_type = (self.strategy1 if self.player1_turn else self.strategy2).name
+        start = clock()
+        moved = self.make_move(*decision.move, scores=scores)
+        spans.record("apply", start, ai_type)
+        return moved
+
+    def run_strategy(self, ai_type):
+        """Sıradaki oyuncu için verilen AI tipinin kararını hesaplar (oyunun AI tipinden bağımsız)"""
+        strategy = self.current_strategy()
+        if strategy.name != ai_type:
+            current = self.player1 if self.player1_turn else self.player2
+            target = self.player2 if self.player1_turn else self.player1
+            strategy = STRATEGIES[ai_type](self, current, target)
+        strategy.sync()
+        return strategy.decide()
 
     def get_hits(self, player):
-        return [(i // 10, i % 10) for i, val in enumerate(player.search) if val == "H"]
+        return [divmod(i, self.rules.size) for i in iter_bits(player.search.hits)]
 
     def get_neighbors(self, row, col):
-        return [(r, c) for r, c in [(row-1,col), (row+1,col), (row,col-1), (row,col+1)] if 0 <= r < 10 and 0 <= c < 10]
+        size = self.rules.size
+        return [divmod(i, size) for i in neighbor_table(size)[row * size + col]]
 
     def random_ai(self):
-        current = self.player1 if self.player1_turn else self.player2
-        search = current.search
-        choices = [(i // 10, i % 10) for i, val in enumerate(search) if val == "U"]
-        return random.choice(choices) if choices else (0, 0)
+        return self.run_strategy("random").move
 
     def bfs_ai(self):
-        current = self.player1 if self.player1_turn else self.player2
-        search = current.search
-        hits = self.get_hits(current)
-        
-        # Vurulan karelerin etrafını ara
-        if hits:
-            for row, col in hits:
-                for r, c in self.get_neighbors(row, col):
-                    if search[r * 10 + c] == "U":
-                        return r, c
-        
-        # Vurulan kare yoksa, merkeze yakın kareleri ara
-        center_squares = [(i,j) for i in range(3,7) for j in range(3,7)
-                         if search[i * 10 + j] == "U"]
-        if center_squares:
-            return random.choice(center_squares)
-        
-        # Merkezde kare kalmadıysa, rastgele bir kare seç
-        available_moves = [(i // 10, i % 10) for i, val in enumerate(search) if val == "U"]
-        if available_moves:
-            return random.choice(available_moves)
-        
-        # Eğer hiç kare kalmadıysa, ilk boş kareyi seç
-        for i in range(100):
-            if search[i] == "U":
-                return i // 10, i % 10
+        return self.run_strategy("bfs").move
 
     def evaluate_position(self, row, col):
+        return float(self.evaluate_positions()[row, col])
+
+    def evaluate_positions(self):
+        """evaluate_position skorlarının tamamı, size x size dizi olarak (tek bir vektörel çağrı)"""
         current = self.player1 if self.player1_turn else self.player2
-        search = current.search
-        score = 0
-        for r, c in self.get_neighbors(row, col):
-            val = search[r * 10 + c]
-            if val == "H":
-                score += 2
-            elif val == "M":
-                score -= 1
-        center_dist = abs(row - 4.5) + abs(col - 4.5)
-        score += (9 - center_dist) / 2
-        return score
+        size = self.rules.size
+        return greedy_scores(current.search, size, hit_weight=2, miss_weight=-1, parity_bonus=0).reshape(size, size)
 
     def generate_simple_board(self, known_board, ship_sizes):
-        """Basitleştirilmiş gemi yerleştirme stratejisi"""
-        board = [0 for _ in range(100)]
-        max_attempts = 1000  # Maksimum deneme sayısını artırdık
-
-        # Vurulan kareleri bul
-        hit_squares = [(i // 10, i % 10) for i, val in enumerate(known_board) if val == "H"]
-        
-        # Vurulan kareleri kapsayan gemileri yerleştir
-        for hit in hit_squares:
-            hit_covered = False
-            for size in ship_sizes[:]:  # Liste kopyası kullan
-                if hit_covered:
-                    break
-                    
-                # Yatay ve dikey yerleşimleri dene
-                for orientation in ["h", "v"]:
-                    if hit_covered:
-                        break
-                        
-                    # Gemi başlangıç pozisyonunu hesapla
-                    if orientation == "h":
-                        start_col = max(0, hit[1] - size + 1)
-                        start_row = hit[0]
-                    else:
-                        start_row = max(0, hit[0] - size + 1)
-                        start_col = hit[1]
-                    
-                    # Gemi yerleştirme kontrolü
-                    valid = True
-                    indexes = []
-                    
-                    for i in range(size):
-                        r = start_row + (i if orientation == "v" else 0)
-                        c = start_col + (i if orientation == "h" else 0)
-                        
-                        if r >= 10 or c >= 10:
-                            valid = False
-                            break
-                            
-                        idx = r * 10 + c
-                        if known_board[idx] in ["M", "S"] or board[idx] == 1:
-                            valid = False
-                            break
-                            
-                        indexes.append((r, c))
-                    
-                    if valid and hit in indexes:
-                        for r, c in indexes:
-                            board[r * 10 + c] = 1
-                        hit_covered = True
-                        ship_sizes.remove(size)
-                        break
-
-        # Kalan gemileri yerleştir
-        remaining_ships = ship_sizes.copy()
-        for size in remaining_ships:
-            placed = False
-            attempts = 0
-            
-            while not placed and attempts < max_attempts:
-                attempts += 1
-                row = random.randint(0, 9)
-                col = random.randint(0, 9)
-                orientation = random.choice(["h", "v"])
-                
-                valid = True
-                indexes = []
-                
-                for i in range(size):
-                    r = row + (i if orientation == "v" else 0)
-                    c = col + (i if orientation == "h" else 0)
-                    
-                    if r >= 10 or c >= 10:
-                        valid = False
-                        break
-                        
-                    idx = r * 10 + c
-                    if known_board[idx] in ["M", "S"] or board[idx] == 1:
-                        valid = False
-                        break
-                        
-                    indexes.append((r, c))
-                
-                if valid:
-                    for r, c in indexes:
-                        board[r * 10 + c] = 1
-                    placed = True
-                    ship_sizes.remove(size)
-
-        return board
+        """Basitleştirilmiş gemi yerleştirme stratejisi (bkz. strategies.generate_simple_board)"""
+        return generate_simple_board(known_board, ship_sizes, self.rules.size, self.rng)
 
     def create_heatmap(self, score_board, known_board):
         """Creates a heatmap visualization of the Monte Carlo simulation results"""
         import matplotlib.pyplot as plt
         import numpy as np
         
-        # Convert scores to 10x10 matrix
-        heatmap_data = np.array(score_board).reshape(10, 10)
-        mask = np.array(known_board).reshape(10, 10) != "U"
+        known_board = list(known_board)
+        size = self.rules.size
+
+        # Convert scores to a size x size matrix
+        heatmap_data = np.array(score_board).reshape(size, size)
+        mask = np.array(known_board).reshape(size, size) != "U"
         
         # Normalize data between 0-1
         if heatmap_data.max() > heatmap_data.min():
@@ -287,13 +300,13 @@ class Game:
         plt.imshow(heatmap_data, cmap='YlOrRd', interpolation='nearest')
         
         # Mark hit squares
-        for i in range(10):
-            for j in range(10):
-                if known_board[i * 10 + j] == "H":
+        for i in range(size):
+            for j in range(size):
+                if known_board[i * size + j] == "H":
                     plt.plot(j, i, 'go', markersize=12, label='Hit')  # Green circle
-                elif known_board[i * 10 + j] == "M":
+                elif known_board[i * size + j] == "M":
                     plt.plot(j, i, 'kx', markersize=10, label='Miss')  # Black X
-                elif known_board[i * 10 + j] == "S":
+                elif known_board[i * size + j] == "S":
                     plt.plot(j, i, 'rs', markersize=10, label='Sunk')  # Red square
         
         # Add colorbar
@@ -302,8 +315,8 @@ class Game:
         
         # Add grid
         plt.grid(True, which='major', color='black', linestyle='-', linewidth=0.5)
-        plt.xticks(range(10), color='black')
-        plt.yticks(range(10), color='black')
+        plt.xticks(range(size), color='black')
+        plt.yticks(range(size), color='black')
         
         # Set title and labels
         plt.title('Monte Carlo AI Prediction Map', color='black', pad=20)
@@ -328,185 +341,55 @@ class Game:
         
         return heatmap_data
 
-    def greedy_ai(self):
-        current = self.player1 if self.player1_turn else self.player2
-        search = current.search
-        best_score = -float("inf")
-        best_move = (0, 0)
-
-        for i in range(100):
-            if search[i] == "U":
-                row, col = i // 10, i % 10
-                score = 0
+    def greedy_decision(self):
+        return self.run_strategy("greedy")
 
-                for r, c in self.get_neighbors(row, col):
-                    val = search[r * 10 + c]
-                    if val == "H":
-                        score += 3
-                    elif val == "M":
-                        score -= 2
+    def greedy_ai(self):
+        return self.greedy_decision().move
 
-                center_dist = abs(row - 4.5) + abs(col - 4.5)
-                score += (9 - center_dist) / 2
+    def monte_carlo_decision(self):
+        return self.run_strategy("monte_carlo")
 
-                if (row + col) % 2 == 0:
-                    score += 0.5
+    def monte_carlo_ai(self):
+        return self.monte_carlo_decision().move
 
-                if score > best_score:
-                    best_score = score
-                    best_move = (row, col)
+    def remaining_ship_sizes(self, target_player):
+        """Henüz batırılmamış gemilerin boyları (batan gemiler oyunda ilan edilir)"""
+        return [ship.size for ship in target_player.ships if ship.hits < ship.size]
 
-        return best_move
+    def probability_decision(self):
+        return self.run_strategy("probability")
 
-    def monte_carlo_ai(self):
-        current = self.player1 if self.player1_turn else self.player2
-        search = current.search
-        hits = self.get_hits(current)
-        
-        # 1. Vurulan karenin etrafını ara (BFS benzeri strateji)
-        if hits:
-            for row, col in hits:
-                for r, c in self.get_neighbors(row, col):
-                    if search[r * 10 + c] == "U":
-                        return r, c
-        
-        # 2. Monte Carlo simülasyonu için skor tablosu
-        score_board = np.zeros((10, 10))
-        
-        # Vurulan, ıskalanan ve batık kareleri -1 yap
-        for i in range(100):
-            if search[i] != "U":
-                score_board[i // 10][i % 10] = -1
-        
-        # 3. Daha fazla simülasyon yap
-
-        num_simulations = 100  # Simülasyon sayısını artırdık
-        
-        for _ in range(num_simulations):
-            # Basit gemi yerleşimi oluştur
-            temp_board = self.generate_simple_board(search, [5, 4, 3, 3, 2])
-            
-            # Skor tablosunu güncelle
-            for i in range(100):
-                if temp_board[i] == 1 and score_board[i // 10][i % 10] != -1:
-                    score_board[i // 10][i % 10] += 1
-        
-        # 4. Vurulan karelerin etrafına daha yüksek bonus puan ver
-        for row, col in hits:
-            for r, c in self.get_neighbors(row, col):
-                if 0 <= r < 10 and 0 <= c < 10 and score_board[r][c] != -1:
-                    score_board[r][c] += 20  # Bonus puanı artırdık
-        
-        # 5. Merkeze yakın karelere daha yüksek bonus puan ver
-        for i in range(10):
-            for j in range(10):
-                if score_board[i][j] != -1:
-                    center_dist = abs(i - 4.5) + abs(j - 4.5)
-                    score_board[i][j] += (9 - center_dist) * 3  # Merkez bonusunu artırdık
-        
-        # 6. Vurulan karelerin etrafındaki karelerin etrafına da bonus puan ver
-        for row, col in hits:
-            for r, c in self.get_neighbors(row, col):
-                if 0 <= r < 10 and 0 <= c < 10 and score_board[r][c] != -1:
-                    for r2, c2 in self.get_neighbors(r, c):
-                        if 0 <= r2 < 10 and 0 <= c2 < 10 and score_board[r2][c2] != -1:
-                            score_board[r2][c2] += 10  # Bonus puanı artırdık
-        
-        # 7. Heatmap'i göster
-        self.create_heatmap(score_board.flatten(), search)
-        
-        # 8. En yüksek skorlu hücreyi seç
-        max_score = -1
-        best_move = None
-        
-        for i in range(10):
-            for j in range(10):
-                if score_board[i][j] > max_score:
-                    max_score = score_board[i][j]
-                    best_move = (i,j)
-        
-        # 9. Eğer en iyi hamle bulunamadıysa, merkeze yakın bir kare seç
-        if best_move is None:
-            center_squares = [(i,j) for i in range(3,7) for j in range(3,7)
-                            if search[i * 10 + j] == "U"]
-            if center_squares:
-                best_move = random.choice(center_squares)
-            else:
-                available_moves = [(i // 10, i % 10) for i, val in enumerate(search) if val == "U"]
-                if available_moves:
-                    best_move = random.choice(available_moves)
-        
-        return best_move
+    def probability_ai(self):
+        return self.probability_decision().move
 
     def get_ai_scores(self, player_num):
-        """Belirtilen oyuncu için skor matrisini hesaplar ve döndürür"""
-        if player_num == 1:
-            current = self.player1
-            ai_type = self.ai_type
-        else:
-            current = self.player2
-            ai_type = self.ai_type2
-            
-        search = current.search
-        scores = np.zeros((10, 10))
-        
-        if ai_type == "greedy":
-            # Greedy AI için skor hesaplama
-            for i in range(10):
-                for j in range(10):
-                    if search[i * 10 + j] == "U":
-                        score = 0
-                        # Komşu kareleri kontrol et
-                        for r, c in self.get_neighbors(i, j):
-                            val = search[r * 10 + c]
-                            if val == "H":
-                                score += 3
-                            elif val == "M":
-                                score -= 2
-                        
-                        # Merkeze yakınlık bonusu
-                        center_dist = abs(i - 4.5) + abs(j - 4.5)
-                        score += (9 - center_dist) / 2
-                        
-                        # Çapraz kare bonusu
-                        if (i + j) % 2 == 0:
-                            score += 0.5
-                            
-                        scores[i][j] = score
-                    else:
-                        scores[i][j] = -1
-                        
-        elif ai_type == "monte_carlo":
-            # Monte Carlo AI için skor hesaplama
-            hits = self.get_hits(current)
-            
-            # Monte Carlo simülasyonları
-            num_simulations = 100
-            for _ in range(num_simulations):
-                temp_board = self.generate_simple_board(search, [5, 4, 3, 3, 2])
-                for i in range(100):
-                    if temp_board[i] == 1 and search[i] == "U":
-                        scores[i // 10][i % 10] += 1
-            
-            # Vurulan karelerin etrafına bonus
-            for row, col in hits:
-                for r, c in self.get_neighbors(row, col):
-                    if 0 <= r < 10 and 0 <= c < 10 and search[r * 10 + c] == "U":
-                        scores[r][c] += 20
-            
-            # Merkez bonusu
-            for i in range(10):
-                for j in range(10):
-                    if search[i * 10 + j] == "U":
-                        center_dist = abs(i - 4.5) + abs(j - 4.5)
-                        scores[i][j] += (9 - center_dist) * 3
-            
-            # Vurulan karelerin çevresine bonus
-            for row, col in hits:
-                for r, c in self.get_neighbors(row, col):
-                    if 0 <= r < 10 and 0 <= c < 10 and search[r * 10 + c] == "U":
-                        for r2, c2 in self.get_neighbors(r, c):
-                            if 0 <= r2 < 10 and 0 <= c2 < 10 and search[r2 * 10 + c2] == "U":
-                                scores[r2][c2] += 10
-        
-        return scores
\ No newline at end of file
+        """Belirtilen oyuncunun skor matrisi; oyunun RNG'sini ilerletmez, dinleyicileri ve ölçümleri tetiklemez"""
+        player1_turn = self.player1_turn
+        rng_state = self.rng.getstate()
+        listeners, self._score_listeners = self._score_listeners, []
+        instruments, self.instruments = self.instruments, None
+        self.player1_turn = player_num == 1
+        try:
+            decision = self.decide()
+        finally:
+            self.player1_turn = player1_turn
+            self.rng.setstate(rng_state)
+            self._score_listeners = listeners
+            self.instruments = instruments
+
+        if decision.scores is None:
+            return np.zeros((self.rules.size, self.rules.size))
+        return decision.scores
+
+
+def replay_game(log, rules=DEFAULT_RULES):
+    """Game.move_log kaydından (oyun, MoveRecord listesi) döndürür; hamleler replay_move ile uygulanır"""
+    game = Game(True, True, rules=rules, fleets=log["ships"])
+    return game, [MoveRecord(*move) for move in log["moves"]]
+
+
+def decide_copy(game):
+    """Süreç havuzu giriş noktası: oyunun kopyası için (karar, RNG durumu) döndürür"""
+    decision = game.decide()
+    return decision, game.rng.getstate()
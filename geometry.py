@@ -0,0 +1,100 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Tahta geometrisinin sabit tabloları. Hepsi kenar uzunluğuyla (ya da Rules ile) anahtarlanır,
+# ilk istekte bir kez kurulur ve önbellekte tutulur; diziler salt okunurdur.
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(size):
+    """Her hücrenin komşuları (yukarı, aşağı, sol, sağ sırasıyla)"""
+    return tuple(
+        tuple(r * size + c for r, c in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+              if 0 <= r < size and 0 <= c < size)
+        for row in range(size) for col in range(size)
+    )
+
+
+@lru_cache(maxsize=None)
+def neighbor_arrays(size):
+    """neighbor_table'ın hücre başına intp dizileri; skor dizilerini liste kurmadan indekslemek için"""
+    arrays = tuple(np.array(neighbors, dtype=np.intp) for neighbors in neighbor_table(size))
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=None)
+def padded_neighbor_table(size):
+    """(size*size, 4) komşu tablosu; eksik komşular size*size numaralı dolgu sütununu gösterir"""
+    cells = size * size
+    table = np.full((cells, 4), cells)
+    for cell, neighbors in enumerate(neighbor_table(size)):
+        table[cell, :len(neighbors)] = neighbors
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def center_squares(rules):
+    """Tahtanın ortasındaki 4x4 bloğun hücreleri"""
+    center = rules.center_range
+    return tuple(i * rules.size + j for i in center for j in center)
+
+
+@lru_cache(maxsize=None)
+def center_distances(size):
+    """Her hücrenin merkeze Manhattan uzaklığı; köşeler size - 1 uzaklıktadır"""
+    center = (size - 1) / 2
+    cells = np.arange(size * size)
+    distances = np.abs(cells // size - center) + np.abs(cells % size - center)
+    distances.setflags(write=False)
+    return distances
+
+
+@lru_cache(maxsize=None)
+def center_bonus(size):
+    """Merkeze yakınlık puanı (size - 1 - uzaklık) / 2: merkezde en yüksek, köşelerde 0"""
+    bonus = (size - 1 - center_distances(size)) / 2
+    bonus.setflags(write=False)
+    return bonus
+
+
+@lru_cache(maxsize=None)
+def parity_table(size):
+    """Satır + sütun toplamı çift olan hücrelerde 1, diğerlerinde 0 (dama deseni)"""
+    cells = np.arange(size * size)
+    parity = ((cells // size + cells % size) % 2 == 0).astype(float)
+    parity.setflags(write=False)
+    return parity
+
+
+@lru_cache(maxsize=None)
+def ship_cells(ship_size, row, col, orientation, board_size=10):
+    """Bir geminin (hücre indeksleri, bit maskesi); tahtadan taşan gemi için ((), 0)"""
+    indexes = []
+    for i in range(ship_size):
+        r = row + (i if orientation == "v" else 0)
+        c = col + (i if orientation == "h" else 0)
+        if r >= board_size or c >= board_size:
+            return (), 0
+        indexes.append(r * board_size + c)
+    return tuple(indexes), sum(1 << i for i in indexes)
+
+
+def neighbor_counts(cells, size):
+    """Her hücrenin kaç 4-komşusu ``cells`` içinde, kaydırılmış dizilerle.
+
+    ``cells`` is a bool array whose last axis has size*size entries, e.g.
+    one board of shape (size*size,) or a batch of shape (N, size*size);
+    the counts come back in the same shape.
+    """
+    grid = cells.reshape(-1, size, size).astype(np.int8)
+    counts = np.zeros_like(grid)
+    counts[:, 1:, :] += grid[:, :-1, :]
+    counts[:, :-1, :] += grid[:, 1:, :]
+    counts[:, :, 1:] += grid[:, :, :-1]
+    counts[:, :, :-1] += grid[:, :, 1:]
+    return counts.reshape(cells.shape)
+
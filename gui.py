@@ -1,19 +1,18 @@
-import pygame
-from engine import Game
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-import seaborn as sns
-from PIL import Image, ImageTk
+import argparse
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pygame
+from board import Board, iter_bits
+from engine import Game, decide_copy, replay_game
 
 # Initialize pygame
 pygame.init()
 pygame.font.init()
-pygame.display.set_caption("Battleship")
 
 # Global variables
 SQ_SIZE = 30
@@ -23,7 +22,9 @@ GRID_SPACING = SQ_SIZE * 2  # Space between grids
 WIDTH = SQ_SIZE * 10 * 2 + H_MARGIN + GRID_SPACING
 HEIGHT = SQ_SIZE * 10 * 2 + V_MARGIN * 2 + GRID_SPACING
 INDENT = 10
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+FAST_FORWARD_FPS = 240  # Hızlı ileri sarmada kare sınırı; AI süreci de CPU bulabilsin
+REPLAY_SPEEDS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)  # Yeniden oynatma hızları (hamle/s)
+SCREEN = None  # Pencere main() içinde açılır; AI süreci bu modülü yüklerken pencere açmaz
 
 # Game states
 GAME_STATES = {
@@ -40,7 +41,7 @@ HUMAN1 = True
 HUMAN2 = False
 
 # AI settings
-AI_TYPES = ["random", "bfs", "greedy", "monte_carlo"]
+AI_TYPES = ["random", "bfs", "greedy", "monte_carlo", "probability"]
 AI_TYPE = "monte_carlo"
 AI_TYPE_INDEX = AI_TYPES.index(AI_TYPE)
 AI_TYPE2 = "random"  # Default value changed to random
@@ -57,6 +58,11 @@ BLACK = (0, 0, 0)
 DARK_GREY = (30, 30, 30)
 LIGHT_GREY = (60, 60, 60)
 
+# YlOrRd (ColorBrewer, 9 sınıf) renk durakları: Game.create_heatmap'in renk haritası
+YLORRD = ((255, 255, 204), (255, 237, 160), (254, 217, 118), (254, 178, 76), (253, 141, 60),
+          (252, 78, 42), (227, 26, 28), (189, 0, 38), (128, 0, 38))
+HEATMAP_SIZE = 200
+
 # Fonts
 COLORS = {"U": GREY, "M": BLUE, "H": ORANGE, "S": RED}
 titlefont = pygame.font.SysFont("freesansttf", 72)
@@ -97,6 +103,142 @@ class Button:
         return False
 
 
+class AIWorker:
+    """AI kararlarını ayrı bir süreçte hesaplar; olay döngüsü hiç beklemez"""
+
+    def __init__(self):
+        # spawn: çocuk süreç gui'yi (ve pencereyi) değil yalnızca engine'i yükler;
+        # düşük öncelik, tek çekirdekte bile çizim döngüsünün önce çalışmasını sağlar
+        # (os.nice olmayan platformlarda, ör. Windows, işçi normal öncelikte çalışır)
+        self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=getattr(os, "nice", None), initargs=(19,))
+        self._future = None
+        self._game = None
+
+    @property
+    def busy(self):
+        return self._future is not None
+
+    def submit(self, game):
+        self._game = game
+        self._future = self._executor.submit(decide_copy, game)
+
+    def poll(self, game):
+        """Returns the Decision for ``game`` once it is ready, otherwise None"""
+        if self._future is None or self._game is not game or not self._future.done():
+            return None
+        future, self._future, self._game = self._future, None, None
+        decision, rng_state = future.result()
+        game.rng.setstate(rng_state)
+        return decision
+
+    def cancel(self):
+        if self._future is not None:
+            self._future.cancel()
+        self._future = self._game = None
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FrameTimes:
+    """Histogram of per-frame work time: event handling and drawing, without the tick sleep"""
+
+    EDGES = (2, 4, 8, 16.7, 33, 50, 100)  # Kova üst sınırları (ms)
+
+    def __init__(self, budget_ms=1000 / 60):
+        self.budget_ms = budget_ms
+        self.counts = [0] * (len(self.EDGES) + 1)
+        self.frames = 0
+        self.worst_ms = 0.0
+
+    def add(self, ms):
+        bucket = 0
+        while bucket < len(self.EDGES) and ms > self.EDGES[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.frames += 1
+        self.worst_ms = max(self.worst_ms, ms)
+
+    @property
+    def over_budget(self):
+        return sum(count for edge, count in zip((0,) + self.EDGES, self.counts) if edge >= self.budget_ms)
+
+    def lines(self):
+        labels = [f"<= {edge:g} ms" for edge in self.EDGES] + [f"> {self.EDGES[-1]:g} ms"]
+        lines = [f"{label:>10}: {count}" for label, count in zip(labels, self.counts)]
+        lines.append(f"{self.frames} frames, worst {self.worst_ms:.1f} ms, "
+                     f"{self.over_budget} over the {self.budget_ms:.1f} ms budget")
+        return lines
+
+    def draw(self):
+        """Histogramı ekranın sol altına çizer (F3 ile açılıp kapanır)"""
+        top = HEIGHT - 40 - 20 * len(self.counts)
+        panel = pygame.Rect(10, top - 10, 330, 20 * len(self.counts) + 40)
+        pygame.draw.rect(SCREEN, DARK_GREY, panel, border_radius=5)
+        largest = max(self.counts) or 1
+        for i, line in enumerate(self.lines()):
+            SCREEN.blit(smallfont.render(line, True, WHITE), (20, top + 20 * i))
+            if i < len(self.counts):
+                bar = pygame.Rect(170, top + 20 * i + 4, int(160 * self.counts[i] / largest), 10)
+                pygame.draw.rect(SCREEN, RED if i >= self.EDGES.index(16.7) + 1 else GREEN, bar)
+        return panel
+
+
+def create_game(human1, human2, ai_type="random", ai_type2="random"):
+    """Creates a game; the guide heatmap is refreshed from the score matrix of each applied decision"""
+    return Game(human1, human2, ai_type=ai_type, ai_type2=ai_type2)
+
+
+@lru_cache(maxsize=None)
+def heatmap_lut(stops=YLORRD, levels=256):
+    """Renk duraklarını doğrusal aradeğerleme ile (levels, 3) uint8 bir renk tablosuna açar"""
+    stops = np.array(stops, dtype=float)
+    positions = np.linspace(0, 1, len(stops))
+    x = np.linspace(0, 1, levels)
+    lut = np.stack([np.interp(x, positions, stops[:, channel]) for channel in range(3)], axis=1)
+    lut = lut.round().astype(np.uint8)
+    lut.setflags(write=False)
+    return lut
+
+
+def heatmap_surface(scores, known_board, size=HEATMAP_SIZE):
+    """Skor matrisini doğrudan size x size bir pygame yüzeyine çevirir"""
+    cells = list(known_board)
+    n = int(round(len(cells) ** 0.5))
+    scores = np.asarray(scores, dtype=float).reshape(n, n)
+    low, high = scores.min(), scores.max()
+    if high > low:
+        levels = ((scores - low) * (255 / (high - low))).astype(np.intp)
+    else:
+        levels = np.zeros((n, n), dtype=np.intp)
+    # surfarray (x, y) sırası bekler: satır x sütun matrisinin devriği
+    pixels = heatmap_lut()[levels.T]
+    surface = pygame.transform.scale(pygame.surfarray.make_surface(pixels), (size, size))
+
+    cell = size / n
+    for index, state in enumerate(cells):
+        if state == "U":
+            continue
+        x = int((index % n + 0.5) * cell)
+        y = int((index // n + 0.5) * cell)
+        r = max(2, int(cell / 4))
+        if state == "H":
+            pygame.draw.circle(surface, GREEN, (x, y), r)
+        elif state == "M":
+            pygame.draw.line(surface, BLACK, (x - r, y - r), (x + r, y + r), 2)
+            pygame.draw.line(surface, BLACK, (x - r, y + r), (x + r, y - r), 2)
+        else:
+            pygame.draw.rect(surface, RED, pygame.Rect(x - r, y - r, 2 * r, 2 * r))
+    return surface
+
+
+def ai_to_move(game):
+    """Oyun bitmediyse ve sıra bir AI oyuncudaysa True"""
+    ai_turn = (game.player1_turn and not game.human1) or (not game.player1_turn and not game.human2)
+    return ai_turn and not game.over
+
+
 def draw_menu():
     """Draws the main menu"""
     # Title
@@ -118,23 +260,33 @@ def draw_menu():
     return buttons
 
 
-def draw_grid(player, left=0, top=0, search=False):
-    """Oyun tahtasını çizer"""
+def draw_grid(player, left=0, top=0, search=False, surface=None):
+    """Oyun tahtasını çizer (varsayılan olarak ekrana)"""
+    surface = SCREEN if surface is None else surface
     try:
         for i in range(100):
             x = left + (i % 10) * SQ_SIZE
             y = top + (i // 10) * SQ_SIZE
             square = pygame.Rect(x, y, SQ_SIZE, SQ_SIZE)
-            pygame.draw.rect(SCREEN, WHITE, square, width=2)
+            pygame.draw.rect(surface, WHITE, square, width=2)
             
             if search and player and player.search:
-                pygame.draw.circle(SCREEN, COLORS[player.search[i]], (x + SQ_SIZE // 2, y + SQ_SIZE // 2), SQ_SIZE // 4)
+                draw_shot(surface, left, top, i, player.search[i])
     except Exception as e:
         print(f"Grid çizim hatası: {e}")
 
 
-def draw_ships(player, left=0, top=0):
-    """Gemileri çizer"""
+def draw_shot(surface, left, top, index, state):
+    """Atış tahtasındaki bir hücrenin işaretini çizer ve hücrenin dikdörtgenini döndürür"""
+    x = left + (index % 10) * SQ_SIZE
+    y = top + (index // 10) * SQ_SIZE
+    pygame.draw.circle(surface, COLORS[state], (x + SQ_SIZE // 2, y + SQ_SIZE // 2), SQ_SIZE // 4)
+    return pygame.Rect(x, y, SQ_SIZE, SQ_SIZE)
+
+
+def draw_ships(player, left=0, top=0, surface=None):
+    """Gemileri çizer (varsayılan olarak ekrana)"""
+    surface = SCREEN if surface is None else surface
     try:
         if player and player.ships:
             for ship in player.ships:
@@ -142,13 +294,13 @@ def draw_ships(player, left=0, top=0):
                 y = top + ship.row * SQ_SIZE + INDENT
                 width = ship.size * SQ_SIZE - 2 * INDENT if ship.orientation == "h" else SQ_SIZE - 2 * INDENT
                 height = SQ_SIZE - 2 * INDENT if ship.orientation == "h" else ship.size * SQ_SIZE - 2 * INDENT
-                pygame.draw.rect(SCREEN, GREEN, pygame.Rect(x, y, width, height), border_radius=10)
+                pygame.draw.rect(surface, GREEN, pygame.Rect(x, y, width, height), border_radius=10)
     except Exception as e:
         print(f"Gemi çizim hatası: {e}")
 
 
-def draw_guide():
-    """Draws the AI guide"""
+def draw_guide(heatmap=None):
+    """Draws the AI guide; ``heatmap`` is a (surface, label) pair from the last scored AI move"""
     # Title
     title = titlefont.render("AI GUIDE", True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 60))
@@ -158,7 +310,8 @@ def draw_guide():
     ai_info = [
         ("RANDOM AI", "The simplest AI type. Makes random shots. Ideal for beginners."),
         ("BFS AI", "Searches around when it finds a ship. Makes logical moves."),
-        ("MONTE CARLO AI", "The most advanced AI. Calculates probabilities and selects the best move. A tough opponent.")
+        ("MONTE CARLO AI", "The most advanced AI. Calculates probabilities and selects the best move. A tough opponent."),
+        ("PROBABILITY AI", "Counts every possible ship placement exactly and shoots the most likely square.")
     ]
 
     y = 140
@@ -173,21 +326,13 @@ def draw_guide():
 
         y += 100
 
-    # Heatmap example for Monte Carlo AI
-    if os.path.exists('monte_carlo_heatmap.png'):
-        try:
-            # Load and display heatmap image
-            heatmap_img = pygame.image.load('monte_carlo_heatmap.png')
-            # Scale the image to fit
-            heatmap_img = pygame.transform.scale(heatmap_img, (200, 200))
-            # Position the heatmap
-            SCREEN.blit(heatmap_img, (WIDTH - 250, 200))
-            
-            # Add heatmap description
-            heatmap_desc = smallfont.render("Monte Carlo AI's probability heatmap", True, WHITE)
-            SCREEN.blit(heatmap_desc, (WIDTH - 250, 180))
-        except Exception as e:
-            print(f"Heatmap loading error: {e}")
+    # Son AI kararının skor matrisi (henüz yoksa boş bir harita)
+    if heatmap is None:
+        heatmap = (heatmap_surface(np.zeros(100), Board()), "AI probability heatmap")
+    heatmap_img, label = heatmap
+    SCREEN.blit(heatmap_img, (WIDTH - 250, 200))
+    heatmap_desc = smallfont.render(label, True, WHITE)
+    SCREEN.blit(heatmap_desc, (WIDTH - 250, 180))
 
     # Bottom info
     info_text = "Each AI type offers a different difficulty level. In AI vs AI mode, you can compare two different AIs."
@@ -280,8 +425,122 @@ def draw_ai_vs_ai_select():
     return buttons
 
 
+GAME_CONTROLS = "SPACE - Pause  |  F - Fast-forward  |  RETURN - New Game  |  ESC - Menu"
+REPLAY_CONTROLS = "SPACE - Pause  |  UP/DOWN - Speed  |  LEFT/RIGHT - Step  |  RETURN - Next  |  ESC - Quit"
+
+
+class GameView:
+    """Oyun ekranının önbellekli çizicisi; update yalnızca değişen hücre ve metin dikdörtgenlerini döndürür"""
+
+    def __init__(self, game, player1_text, player2_text, ai_text, controls=GAME_CONTROLS):
+        self.game = game
+        self.background = pygame.Surface((WIDTH, HEIGHT))
+        self.background.fill(BLACK)
+        left1 = H_MARGIN // 2
+        left2 = WIDTH - H_MARGIN // 2 - SQ_SIZE * 10
+        ship_top = HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING
+
+        # Sol üst: Oyuncu 1'in atışları (player2.search), sağ üst: Oyuncu 2'nin atışları (player1.search)
+        self.boards = [[game.player2.search, left1, None], [game.player1.search, left2, None]]
+        for player, left in ((game.player1, left1), (game.player2, left2)):
+            draw_grid(player, left=left, top=V_MARGIN, surface=self.background)
+            draw_grid(player, left=left, top=ship_top, surface=self.background)
+            draw_ships(player, left=left, top=ship_top, surface=self.background)
+
+        # Oyuncu panelleri ve isimleri
+        panel_height = 60
+        panel_top = V_MARGIN - panel_height - 10
+        for text, left in ((player1_text, left1), (player2_text, left2)):
+            panel = pygame.Rect(left - 10, panel_top, SQ_SIZE * 10 + 20, panel_height)
+            pygame.draw.rect(self.background, DARK_GREY, panel, border_radius=10)
+            surface = myfont.render(text, True, WHITE)
+            self.background.blit(surface, surface.get_rect(center=panel.center))
+
+        # Bottom control panel
+        controls_panel = pygame.Rect(0, HEIGHT - V_MARGIN // 2 - 20, WIDTH, V_MARGIN // 2)
+        pygame.draw.rect(self.background, DARK_GREY, controls_panel)
+        controls_surface = smallfont.render(controls, True, WHITE)
+        self.background.blit(controls_surface, controls_surface.get_rect(center=(WIDTH // 2, HEIGHT - V_MARGIN // 4)))
+
+        # Info bar
+        pygame.draw.rect(self.background, DARK_GREY, pygame.Rect(0, 0, WIDTH, 35))
+        self.background.blit(smallfont.render(ai_text, True, WHITE), (20, 10))
+
+        self._texts = {}  # anahtar -> (metin, ekrandaki dikdörtgen)
+        self._game_over = False
+        self._full = True
+
+    def invalidate(self):
+        """Bir sonraki update'in tüm ekranı yeniden çizmesini sağlar (ör. F3 paneli kapanınca)"""
+        self._full = True
+
+    def _update_cells(self):
+        dirty = []
+        for entry in self.boards:
+            board, left, drawn = entry
+            state = (board.hits, board.misses, board.sunk)
+            if drawn is None:
+                changed = board.full_mask
+            else:
+                changed = (state[0] ^ drawn[0]) | (state[1] ^ drawn[1]) | (state[2] ^ drawn[2])
+            for index in iter_bits(changed):
+                dirty.append(draw_shot(self.background, left, V_MARGIN, index, board[index]))
+            entry[2] = state
+        return dirty
+
+    def _draw_game_over(self):
+        overlay = pygame.Surface((WIDTH, HEIGHT))
+        overlay.fill(BLACK)
+        overlay.set_alpha(128)
+        self.background.blit(overlay, (0, 0))
+
+        text_surface = myfont.render(f"GAME OVER - PLAYER {self.game.result} WINS!", True, WHITE)
+        new_game_surface = smallfont.render("Press RETURN for a new game", True, WHITE)
+        self.background.blit(text_surface, text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+        self.background.blit(new_game_surface, new_game_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50)))
+
+    def _update_text(self, key, text, position, color):
+        old_text, old_rect = self._texts.get(key, (None, None))
+        if text == old_text:
+            return []
+        dirty = []
+        if old_rect is not None:
+            SCREEN.blit(self.background, old_rect, old_rect)
+            dirty.append(old_rect)
+        rect = SCREEN.blit(smallfont.render(text, True, color), position) if text else None
+        if rect is not None:
+            dirty.append(rect)
+        self._texts[key] = (text, rect)
+        return dirty
+
+    def update(self, status, thinking):
+        """Draws what changed since the last call and returns the dirty rectangles"""
+        cells = self._update_cells()
+        if self.game.over and not self._game_over:
+            self._draw_game_over()
+            self._game_over = True
+            self._full = True
+
+        if self._full:
+            SCREEN.blit(self.background, (0, 0))
+            self._texts.clear()
+            dirty = [SCREEN.get_rect()]
+            self._full = False
+        else:
+            for rect in cells:
+                SCREEN.blit(self.background, rect, rect)
+            dirty = cells
+
+        dirty += self._update_text("status", status, (WIDTH // 2 - 50, 10), WHITE)
+        dirty += self._update_text("thinking", thinking, (WIDTH - 200, 10), ORANGE)
+        return dirty
+
+
 def main():
-    global current_state, game, AI_TYPE, AI_TYPE_INDEX, AI_TYPE2, AI_TYPE_INDEX2, HUMAN1, HUMAN2
+    global current_state, game, AI_TYPE, AI_TYPE_INDEX, AI_TYPE2, AI_TYPE_INDEX2, HUMAN1, HUMAN2, SCREEN
+
+    pygame.display.set_caption("Battleship")
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 
     game = None
     pausing = False
@@ -289,166 +548,99 @@ def main():
     clock = pygame.time.Clock()
     game_type = None
     buttons = []
+    ai_worker = AIWorker()
+    ai_decision = None  # Hazır ama henüz uygulanmamış AI kararı
+    frame_times = FrameTimes()
+    show_frame_times = False
+    heatmap = None  # Rehberdeki canlı heatmap: (yüzey, etiket)
 
-    # Create initial heatmap for guide
-    if not os.path.exists('monte_carlo_heatmap.png'):
-        try:
-            from engine import Game
-            temp_game = Game(False, False, ai_type="monte_carlo")
-            temp_game.create_heatmap([0]*100, ["U"]*100)
-        except Exception as e:
-            print(f"Heatmap creation error: {e}")
+    view = None  # Oyun ekranının önbellekli çizicisi (GameView)
+    drawn_state = None  # Menü ekranları yalnızca durum değişince ya da bir olaydan sonra yeniden çizilir
+    fast_forward = False
 
     while True:
         try:
+            frame_start = time.perf_counter()
             current_time = pygame.time.get_ticks()
-            SCREEN.fill(BLACK)
+            dirty = []
 
             # Mevcut ekranı çiz
-            if current_state == GAME_STATES["MENU"]:
-                buttons = draw_menu()
-            elif current_state == GAME_STATES["AI_SELECT"]:
-                buttons = draw_ai_select()
-            elif current_state == GAME_STATES["AI_VS_AI_SELECT"]:
-                buttons = draw_ai_vs_ai_select()
-            elif current_state == GAME_STATES["GUIDE"]:
-                buttons = draw_guide()
-            elif current_state == GAME_STATES["GAME"] and game:
-                # Oyun ekranını çiz
-                # Sol üst grid (Oyuncu 1'in atış tahtası)
-                draw_grid(game.player2, left=H_MARGIN // 2, top=V_MARGIN, search=True)
-
-                # Sol alt grid (Oyuncu 1'in gemileri)
-                draw_grid(game.player1, left=H_MARGIN // 2, top=HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING)
-                draw_ships(game.player1, left=H_MARGIN // 2, top=HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING)
-
-                # Sağ üst grid (Oyuncu 2'nin atış tahtası)
-                draw_grid(game.player1, left=WIDTH - H_MARGIN // 2 - SQ_SIZE * 10, top=V_MARGIN, search=True)
-
-                # Sağ alt grid (Oyuncu 2'nin gemileri)
-                draw_grid(game.player2, left=WIDTH - H_MARGIN // 2 - SQ_SIZE * 10,
-                          top=HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING)
-                draw_ships(game.player2, left=WIDTH - H_MARGIN // 2 - SQ_SIZE * 10,
-                           top=HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING)
-
-                # Oyuncu panelleri
-                # Sol panel (Oyuncu 1)
-
-                panel_height = 60  # Yükseklik sabitlendi
-                panel_top = V_MARGIN - panel_height - 10  # Gridin tam üstüne gelsin
-
-                player1_panel = pygame.Rect(H_MARGIN // 2 - 10, panel_top, SQ_SIZE * 10 + 20, panel_height)
-
-                pygame.draw.rect(SCREEN, DARK_GREY, player1_panel, border_radius=10)
-
-                # Sağ panel (Oyuncu 2)
-                player2_panel = pygame.Rect(WIDTH - H_MARGIN // 2 - SQ_SIZE * 10 - 10, panel_top, SQ_SIZE * 10 + 20,
-                                            panel_height)
-                pygame.draw.rect(SCREEN, DARK_GREY, player2_panel, border_radius=10)
-
-                # Player names
-                player1_text = "PLAYER 1" if game.human1 else f"AI 1 ({AI_TYPE})"
-                player2_text = "PLAYER 2" if game.human2 else (
-                    f"AI 2 ({AI_TYPE2})" if not game.human1 and not game.human2 else f"AI 2 ({AI_TYPE})")
-
-                player1_surface = myfont.render(player1_text, True, WHITE)
-                player2_surface = myfont.render(player2_text, True, WHITE)
-
-                player1_rect = player1_surface.get_rect(
-                    center=(H_MARGIN // 2 + SQ_SIZE * 5, panel_top + panel_height // 2))
-                player2_rect = player2_surface.get_rect(
-                    center=(WIDTH - H_MARGIN // 2 - SQ_SIZE * 5, panel_top + panel_height // 2))
-
-                SCREEN.blit(player1_surface, player1_rect)
-                SCREEN.blit(player2_surface, player2_rect)
-
-                # Turn indicator
-                current_player = "1" if game.player1_turn else "2"
-                turn_text = f"TURN: PLAYER {current_player}"
-                turn_surface = myfont.render(turn_text, True, ORANGE)
-                turn_rect = turn_surface.get_rect(center=(WIDTH // 2, HEIGHT - V_MARGIN // 2))
-                SCREEN.blit(turn_surface, turn_rect)
-
-                # Grid titles
-                # Left top
-                # attack_title1 = smallfont.render("ATTACK BOARD", True, WHITE)
-                # attack_rect1 = attack_title1.get_rect(center=(H_MARGIN//2 + SQ_SIZE * 1, V_MARGIN - 40))
-                # SCREEN.blit(attack_title1, attack_rect1)
-
-                # Left bottom
-                # ship_title1 = smallfont.render("SHIP BOARD", True, WHITE)
-                # ship_rect1 = ship_title1.get_rect(center=(H_MARGIN//2 + SQ_SIZE * 1, HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING - 40))
-                # SCREEN.blit(ship_title1, ship_rect1)
-
-                # Right top
-                # attack_title2 = smallfont.render("ATTACK BOARD", True, WHITE)
-                # attack_rect2 = attack_title2.get_rect(center=(WIDTH - H_MARGIN//2 - SQ_SIZE * 1, V_MARGIN - 40))
-                # SCREEN.blit(attack_title2, attack_rect2)
-
-                # Right bottom
-                # ship_title2 = smallfont.render("SHIP BOARD", True, WHITE)
-                # ship_rect2 = ship_title2.get_rect(center=(WIDTH - H_MARGIN//2 - SQ_SIZE * 1, HEIGHT - V_MARGIN - SQ_SIZE * 10 - GRID_SPACING - 40))
-                # SCREEN.blit(ship_title2, ship_rect2)
-
-                # Bottom control panel
-                controls_panel = pygame.Rect(0, HEIGHT - V_MARGIN // 2 - 20, WIDTH, V_MARGIN // 2)
-                pygame.draw.rect(SCREEN, DARK_GREY, controls_panel)
-
-                controls = "SPACE - Pause  |  RETURN - New Game  |  ESC - Menu"
-                controls_surface = smallfont.render(controls, True, WHITE)
-                controls_rect = controls_surface.get_rect(center=(WIDTH // 2, HEIGHT - V_MARGIN // 4))
-                SCREEN.blit(controls_surface, controls_rect)
-
-                # Info bars
-                info_bg = pygame.Rect(0, 0, WIDTH, 35)
-                pygame.draw.rect(SCREEN, DARK_GREY, info_bg)
-
-                if game_type == "aivai":
-                    ai_text = f"AI1: {AI_TYPE} vs AI2: {AI_TYPE2}"
-                else:
-                    ai_text = f"PLAYER vs {AI_TYPE} AI"
-                ai_surface = smallfont.render(ai_text, True, WHITE)
-                SCREEN.blit(ai_surface, (20, 10))
-
-                status = "PAUSED" if pausing else "RUNNING"
-                status_text = f"Status: {status}"
-                status_surface = smallfont.render(status_text, True, WHITE)
-                SCREEN.blit(status_surface, (WIDTH // 2 - 50, 10))
-
-                # AI move
-                if not pausing and not game.over:
-                    if ((game.player1_turn and not game.human1) or (not game.player1_turn and not game.human2)) and \
-                            (current_time - last_ai_move_time >= 500):
-                        try:
-                            game.ai_move()
+            if current_state != GAME_STATES["GAME"] or not game:
+                view = None
+                if current_state != drawn_state:
+                    SCREEN.fill(BLACK)
+                    if current_state == GAME_STATES["MENU"]:
+                        buttons = draw_menu()
+                    elif current_state == GAME_STATES["AI_SELECT"]:
+                        buttons = draw_ai_select()
+                    elif current_state == GAME_STATES["AI_VS_AI_SELECT"]:
+                        buttons = draw_ai_vs_ai_select()
+                    elif current_state == GAME_STATES["GUIDE"]:
+                        buttons = draw_guide(heatmap)
+                    dirty = [SCREEN.get_rect()]
+                    drawn_state = current_state
+            else:
+                drawn_state = current_state
+                if view is None or view.game is not game:
+                    # Player names
+                    player1_text = "PLAYER 1" if game.human1 else f"AI 1 ({AI_TYPE})"
+                    player2_text = "PLAYER 2" if game.human2 else (
+                        f"AI 2 ({AI_TYPE2})" if not game.human1 and not game.human2 else f"AI 2 ({AI_TYPE})")
+                    if game_type == "aivai":
+                        ai_text = f"AI1: {AI_TYPE} vs AI2: {AI_TYPE2}"
+                    else:
+                        ai_text = f"PLAYER vs {AI_TYPE} AI"
+                    view = GameView(game, player1_text, player2_text, ai_text)
+
+                # AI move: karar arka planda hesaplanır, hazır olunca ve 500 ms geçince
+                # (hızlı ileri sarmada beklemeden) uygulanır
+                if ai_to_move(game):
+                    try:
+                        if ai_decision is None:
+                            ai_decision = ai_worker.poll(game)
+                        delay = 0 if fast_forward else 500
+                        if ai_decision is not None and not pausing and current_time - last_ai_move_time >= delay:
+                            if ai_decision.scores is not None:
+                                shooter = game.player1 if game.player1_turn else game.player2
+                                ai_type = game.ai_type if game.player1_turn else game.ai_type2
+                                heatmap = (heatmap_surface(ai_decision.scores, shooter.search),
+                                           f"{ai_type} AI's live heatmap")
+                            game.ai_move(ai_decision)
+                            ai_decision = None
                             last_ai_move_time = current_time
-                        except Exception as e:
-                            print(f"AI Move Error: {e}")
-
-                # Game over screen
-                if game.over:
-                    overlay = pygame.Surface((WIDTH, HEIGHT))
-                    overlay.fill(BLACK)
-                    overlay.set_alpha(128)
-                    SCREEN.blit(overlay, (0, 0))
-
-                    text = f"GAME OVER - PLAYER {game.result} WINS!"
-                    new_game_text = "Press RETURN for a new game"
-
-                    text_surface = myfont.render(text, True, WHITE)
-                    new_game_surface = smallfont.render(new_game_text, True, WHITE)
-
-                    text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                    new_game_rect = new_game_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
-
-                    SCREEN.blit(text_surface, text_rect)
-                    SCREEN.blit(new_game_surface, new_game_rect)
+                        # Sıradaki karar, bu kare çizilip beklenirken hesaplanır
+                        if ai_to_move(game) and ai_decision is None and not ai_worker.busy:
+                            ai_worker.submit(game)
+                    except Exception as e:
+                        print(f"AI Move Error: {e}")
+                        ai_decision = None
+
+                # Durum ve sıra göstergesi
+                status = "PAUSED" if pausing else ("FAST-FORWARD" if fast_forward else "RUNNING")
+                status_text = f"Status: {status}  |  TURN: {1 if game.player1_turn else 2}"
+                if fast_forward:
+                    corner_text = f"{clock.get_fps():.0f} FPS"
+                elif ai_worker.busy:
+                    corner_text = f"AI thinking{'.' * (current_time // 300 % 4)}"
+                else:
+                    corner_text = ""
+                dirty = view.update(status_text, corner_text)
 
             # Olayları işle
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    ai_worker.close()
+                    print("\n".join(frame_times.lines()))
                     return
 
+                if (event.type == pygame.KEYDOWN and event.key == pygame.K_F3) or event.type == pygame.WINDOWEXPOSED:
+                    # Ekranın tamamı bir sonraki karede yeniden çizilir
+                    if event.type == pygame.KEYDOWN:
+                        show_frame_times = not show_frame_times
+                    drawn_state = None
+                    if view is not None:
+                        view.invalidate()
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if current_state == GAME_STATES["MENU"]:
                         for i, button in enumerate(buttons):
@@ -462,6 +654,8 @@ def main():
                                 elif i == 2:  # AI Rehberi
                                     current_state = GAME_STATES["GUIDE"]
                                 elif i == 3:  # Çıkış
+                                    ai_worker.close()
+                                    print("\n".join(frame_times.lines()))
                                     return
 
                     elif current_state == GAME_STATES["AI_SELECT"]:
@@ -471,7 +665,7 @@ def main():
                                     AI_TYPE = AI_TYPES[i]
                                     AI_TYPE_INDEX = i
                                     HUMAN1, HUMAN2 = True, False
-                                    game = Game(HUMAN1, HUMAN2, ai_type=AI_TYPE)
+                                    game = create_game(HUMAN1, HUMAN2, ai_type=AI_TYPE)
                                     current_state = GAME_STATES["GAME"]
                                 else:  # Geri butonu
                                     current_state = GAME_STATES["MENU"]
@@ -491,7 +685,7 @@ def main():
                                 elif i == len(buttons) - 2:  # Başlat butonu
                                     if game_type == "aivai":  # Sadece AI vs AI modunda
                                         HUMAN1, HUMAN2 = False, False
-                                        game = Game(HUMAN1, HUMAN2, ai_type=AI_TYPE, ai_type2=AI_TYPE2)
+                                        game = create_game(HUMAN1, HUMAN2, ai_type=AI_TYPE, ai_type2=AI_TYPE2)
                                         current_state = GAME_STATES["GAME"]
                                 else:  # Geri butonu
                                     current_state = GAME_STATES["MENU"]
@@ -518,26 +712,166 @@ def main():
                         if event.key == pygame.K_ESCAPE:
                             current_state = GAME_STATES["MENU"]
                             game = None
+                            ai_worker.cancel()
+                            ai_decision = None
                         elif event.key == pygame.K_SPACE:
                             pausing = not pausing
+                        elif event.key == pygame.K_f:
+                            fast_forward = not fast_forward
                         elif event.key == pygame.K_RETURN:
+                            ai_worker.cancel()
+                            ai_decision = None
                             if game_type == "aivai":
-                                game = Game(HUMAN1, HUMAN2, ai_type=AI_TYPE, ai_type2=AI_TYPE2)
+                                game = create_game(HUMAN1, HUMAN2, ai_type=AI_TYPE, ai_type2=AI_TYPE2)
                             else:
-                                game = Game(HUMAN1, HUMAN2, ai_type=AI_TYPE)
+                                game = create_game(HUMAN1, HUMAN2, ai_type=AI_TYPE)
                             last_ai_move_time = current_time
 
-            pygame.display.flip()
-            clock.tick(60)
+            if show_frame_times:
+                dirty.append(frame_times.draw())
+
+            # Yalnızca değişen bölgeler ekrana aktarılır; boşta bu liste boştur
+            if dirty:
+                pygame.display.update(dirty)
+            frame_times.add((time.perf_counter() - frame_start) * 1000)
+            if fast_forward and current_state == GAME_STATES["GAME"]:
+                clock.tick(FAST_FORWARD_FPS)
+            else:
+                clock.tick(60)
 
         except Exception as e:
             print(f"Ana döngü hatası: {e}")
             continue
 
 
+class Replay:
+    """simulation.py'nin kaydettiği oyunları hamle kayıtlarından strateji çalıştırmadan oynatır"""
+
+    def __init__(self, records):
+        self.records = records
+        self.speed_index = REPLAY_SPEEDS.index(8)
+        self.paused = False
+        self.load(0)
+
+    @property
+    def speed(self):
+        return REPLAY_SPEEDS[self.speed_index]
+
+    def load(self, record_index, position=0):
+        """record_index'teki oyunu kurar ve ilk position hamlesini uygular"""
+        self.record_index = record_index % len(self.records)
+        record = self.records[self.record_index]
+        self.game, self.moves = replay_game(record["log"])
+        self.position = 0
+        self.due = 0.0  # Henüz uygulanmamış hamle payı (hız x geçen süre)
+        self.advance(position)
+
+    def advance(self, count):
+        """En fazla count hamle uygular"""
+        for record in self.moves[self.position:self.position + count]:
+            self.game.replay_move(record)
+        self.position = min(len(self.moves), self.position + count)
+
+    def back(self):
+        if self.position > 0:
+            self.load(self.record_index, self.position - 1)
+
+    def tick(self, elapsed_ms):
+        """Hıza göre bu karede gelen hamleleri uygular"""
+        if self.paused or self.position == len(self.moves):
+            self.due = 0.0
+            return
+        self.due += elapsed_ms * self.speed / 1000
+        count = int(self.due)
+        self.due -= count
+        self.advance(count)
+
+    def view(self):
+        record = self.records[self.record_index]
+        # Eşli turnuvanın yer değiştirilmiş oyununda birinci oyuncu ai2'dir
+        first, second = (record['ai2'], record['ai1']) if record.get('swapped') else (record['ai1'], record['ai2'])
+        return GameView(self.game, f"AI 1 ({first})", f"AI 2 ({second})",
+                        f"{record['match']}  #{record['game']}", controls=REPLAY_CONTROLS)
+
+    def texts(self):
+        """(durum satırı, köşe metni)"""
+        status = f"Game {self.record_index + 1}/{len(self.records)}  |  Move {self.position}/{len(self.moves)}"
+        return status, "PAUSED" if self.paused else f"{self.speed} moves/s"
+
+
+def load_replays(games_filename, match=None):
+    """Yeniden oynatılabilen (10x10, hamle kaydı olan) oyun kayıtlarını okur"""
+    from simulation import read_game_records
+
+    records = []
+    for record in read_game_records(games_filename):
+        if "log" not in record or record["board_size"] != 10 or (match is not None and record["match"] != match):
+            continue
+        records.append(record)
+    return records
+
+
+def run_replay(records):
+    """Kayıtlı oyunları pencerede oynatır; ESC ya da pencereyi kapatmak çıkar"""
+    global SCREEN
+
+    pygame.display.set_caption("Battleship - Replay")
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    replay = Replay(records)
+    view = replay.view()
+    clock = pygame.time.Clock()
+    elapsed = 0
+
+    while True:
+        replay.tick(elapsed)
+        if view.game is not replay.game:
+            view = replay.view()
+        dirty = view.update(*replay.texts())
+        if dirty:
+            pygame.display.update(dirty)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.WINDOWEXPOSED:
+                view.invalidate()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return
+                elif event.key == pygame.K_SPACE:
+                    replay.paused = not replay.paused
+                elif event.key == pygame.K_UP:
+                    replay.speed_index = min(replay.speed_index + 1, len(REPLAY_SPEEDS) - 1)
+                elif event.key == pygame.K_DOWN:
+                    replay.speed_index = max(replay.speed_index - 1, 0)
+                elif event.key == pygame.K_RIGHT:
+                    replay.advance(1)
+                elif event.key == pygame.K_LEFT:
+                    replay.back()
+                elif event.key == pygame.K_RETURN:
+                    replay.load(replay.record_index + 1)
+
+        # Oynarken hız kare hızını aşabilir; duraklatılmış ya da bitmiş bir oyunda döngü boşta bekler
+        playing = not replay.paused and replay.position < len(replay.moves)
+        elapsed = clock.tick(FAST_FORWARD_FPS if playing and replay.speed > 60 else 60)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Battleship")
+    parser.add_argument('--replay', metavar='GAMES_FILE',
+                        help="simulation.py'nin JSONL oyun kayıtlarını AI çalıştırmadan yeniden oynat")
+    parser.add_argument('--match', default=None, help='yalnızca bu eşleşmenin oyunları (ör. "greedy vs random")')
+    args = parser.parse_args()
+
     try:
-        main()
+        if args.replay:
+            replays = load_replays(args.replay, args.match)
+            if not replays:
+                parser.error(f"{args.replay} has no replayable 10x10 games with move logs")
+            run_replay(replays)
+        else:
+            main()
     except Exception as e:
         print(f"Program hatası: {e}")
     finally:
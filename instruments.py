@@ -0,0 +1,72 @@
+import time
+
+# Bir AI turunun adlandırılmış bölümleri
+SPANS = ("decide", "sample", "score", "render", "apply")
+
+# Histogram kovaları: i. kova [2**(i-1), 2**i) mikrosaniye, 0. kova 1 µs altı; sonuncusu taşanları toplar
+BUCKETS = 32
+
+clock = time.perf_counter_ns
+
+
+class Instruments:
+    """AI tipi başına bir turun adlandırılmış bölümleri için sayaçlar ve gecikme histogramları.
+
+    Ölçülen kod yalnızca game.instruments None değilse saati okur; kayıtlar ai_type'a (Game.decide ayarlar) yazılır.
+    """
+
+    def __init__(self):
+        self.ai_type = None
+        # (ai_type, span) -> [sayı, toplam ns, en büyük ns, kova sayıları]
+        self._stats = {}
+
+    def record(self, span, start, ai_type=None):
+        """Adds the time since ``start`` (a ``clock()`` reading) to ``span``"""
+        elapsed = clock() - start
+        key = (ai_type or self.ai_type, span)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = [0, 0, 0, [0] * BUCKETS]
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+        stats[3][min((elapsed // 1000).bit_length(), BUCKETS - 1)] += 1
+
+    def snapshot(self):
+        """JSON'a hazır {ai_type: {span: istatistik}}; sayaçlar, kovalar ve kovalardan türeyen ortalama, p50 ve p99 (µs)"""
+        order = {span: i for i, span in enumerate(SPANS)}
+        snapshot = {}
+        for (ai_type, span), (count, total, longest, buckets) in sorted(
+                self._stats.items(), key=lambda item: (item[0][0], order.get(item[0][1], len(SPANS)))):
+            snapshot.setdefault(ai_type, {})[span] = {
+                'count': count,
+                'total_ns': total,
+                'max_ns': longest,
+                'mean_us': round(total / count / 1000, 3),
+                'p50_us': _bucket_percentile(buckets, count, 0.5),
+                'p99_us': _bucket_percentile(buckets, count, 0.99),
+                'histogram_us': {str(2 ** i): n for i, n in enumerate(buckets) if n},
+            }
+        return snapshot
+
+    def merge(self, snapshot):
+        """Adds the counts of another snapshot (e.g. from a worker process)"""
+        for ai_type, spans in snapshot.items():
+            for span, data in spans.items():
+                stats = self._stats.setdefault((ai_type, span), [0, 0, 0, [0] * BUCKETS])
+                stats[0] += data['count']
+                stats[1] += data['total_ns']
+                stats[2] = max(stats[2], data['max_ns'])
+                for bound, n in data['histogram_us'].items():
+                    stats[3][int(bound).bit_length() - 1] += n
+
+
+def _bucket_percentile(buckets, count, fraction):
+    """Kovaların, sıralı örneklerin ``fraction`` kadarını kapsayan ilk üst sınırı (µs)"""
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= fraction * count:
+            return 2 ** i
+    return 2 ** (len(buckets) - 1)
@@ -0,0 +1,183 @@
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from geometry import ship_cells
+
+
+FLEET_SIZES = (5, 4, 3, 3, 2)
+
+
+@lru_cache(maxsize=None)
+def placement_table(size, board_size=10):
+    """Bir gemi boyu için tüm yasal yerleşimler: (row, col, orientation, indexes, mask) demetleri.
+
+    Horizontal placements come first, then vertical, each in row-major
+    order of the ship's top-left cell. A 10x10 board has
+    2 * 10 * (11 - size) placements, e.g. 180 for a ship of length 2.
+    ``mask`` is the placement as a board_size**2-bit int for bitboard tests.
+    """
+    table = []
+    for orientation in ("h", "v"):
+        for row in range(board_size):
+            for col in range(board_size):
+                indexes, mask = ship_cells(size, row, col, orientation, board_size)
+                if indexes:
+                    table.append((row, col, orientation, indexes, mask))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def placement_masks(size, board_size=10):
+    """placement_table ile aynı sırada (n, board_size**2) bool yerleşim dizisi"""
+    table = placement_table(size, board_size)
+    masks = np.zeros((len(table), board_size * board_size), dtype=bool)
+    for row, (_, _, _, indexes, _) in enumerate(table):
+        masks[row, list(indexes)] = True
+    masks.setflags(write=False)
+    return masks
+
+
+def random_placement(size, occupied, rng=random, board_size=10):
+    """Returns a uniformly chosen placement from placement_table that avoids ``occupied``.
+
+    ``occupied`` is a cell bit mask. Every draw is an on-board placement,
+    so a few draws almost always succeed; if they do not, the legal
+    placements are filtered exactly. Returns None when the ship cannot be
+    placed at all.
+    """
+    table = placement_table(size, board_size)
+    for _ in range(8):
+        placement = rng.choice(table)
+        if not placement[4] & occupied:
+            return placement
+    legal = [placement for placement in table if not placement[4] & occupied]
+    return rng.choice(legal) if legal else None
+
+
+def random_fleets(count, sizes=FLEET_SIZES, rng=None, chunk_size=100_000, board_size=10):
+    """Generates ``count`` random non-overlapping fleets as a (count, board_size**2) int8 array.
+
+    Cell values are 0 for water and k for the k-th ship in ``sizes``. Each
+    ship is drawn uniformly from the placements that do not overlap the
+    ships placed before it, the same distribution Player.place_ships
+    produces, using one matrix product per ship instead of retry loops.
+    The placement tables grow with board_size**3, so this is meant for
+    small boards.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    fleets = np.zeros((count, board_size * board_size), dtype=np.int8)
+    for start in range(0, count, chunk_size):
+        chunk = fleets[start:start + chunk_size]
+        occupied = np.zeros(chunk.shape, dtype=np.float32)
+        for ship_id, size in enumerate(sizes, start=1):
+            matrix = _placement_matrix(size, board_size)
+            keys = rng.random((len(chunk), len(matrix)), dtype=np.float32)
+            keys[occupied @ matrix.T > 0] = -1
+            choice = keys.argmax(axis=1)
+            if (keys[np.arange(len(chunk)), choice] < 0).any():
+                raise ValueError(f"no room left for a ship of size {size}")
+            chosen = placement_masks(size, board_size)[choice]
+            chunk[chosen] = ship_id
+            occupied += chosen
+    return fleets
+
+
+@lru_cache(maxsize=None)
+def _placement_matrix(size, board_size=10):
+    # float32 kopyası: çakışma testleri tek bir matris çarpımı olur
+    return placement_masks(size, board_size).astype(np.float32)
+
+
+def mask_to_array(mask, num_cells=100):
+    """num_cells bitlik bir int maskesini (num_cells,) bool dizisine çevirir"""
+    raw = np.frombuffer(mask.to_bytes((num_cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:num_cells].astype(bool)
+
+
+def _board_arrays(known_board):
+    if hasattr(known_board, "hits"):
+        blocked = mask_to_array(known_board.misses | known_board.sunk, known_board.num_cells)
+        hits = mask_to_array(known_board.hits, known_board.num_cells)
+    else:
+        cells = np.asarray(list(known_board))
+        blocked = (cells == "M") | (cells == "S")
+        hits = cells == "H"
+    return blocked, hits
+
+
+# Bu kenar uzunluğuna kadar yerleşim matrisleri küçüktür ve matris çarpımı en hızlı yoldur
+MATRIX_DENSITY_MAX_SIZE = 16
+
+
+def probability_density(known_board, ship_sizes, board_size=10):
+    """Returns exact per-cell placement counts as a board_size x board_size float array.
+
+    Every placement of every remaining ship that avoids known misses and
+    sunk cells is counted. When there are unsunk hits on the board, a
+    placement is weighted by how many of them it covers, so placements
+    that cannot explain a hit drop out and the density concentrates on
+    the target. Cells that have already been shot score 0.
+
+    Small boards use one matrix product per ship against the placement
+    table; larger boards, where that table grows with board_size**3, count
+    placements with sliding-window sums instead. Both give the same counts.
+    """
+    blocked, hits = _board_arrays(known_board)
+    open_cells = ~(blocked | hits)
+    if board_size <= MATRIX_DENSITY_MAX_SIZE:
+        hunt, target = _matrix_density(blocked, hits, ship_sizes, board_size)
+    else:
+        hunt, target = _window_density(blocked, hits, ship_sizes, board_size)
+
+    density = target if target[open_cells].any() else hunt
+    density = np.where(open_cells, density, 0.0).astype(float)
+    return density.reshape(board_size, board_size)
+
+
+def _matrix_density(blocked, hits, ship_sizes, board_size):
+    blocked = blocked.astype(np.float32)
+    hits = hits.astype(np.float32)
+    targeting = hits.any()
+
+    hunt = np.zeros(board_size * board_size, dtype=np.float32)
+    target = np.zeros(board_size * board_size, dtype=np.float32)
+    for size in ship_sizes:
+        matrix = _placement_matrix(size, board_size)
+        valid = (matrix @ blocked == 0).astype(np.float32)
+        hunt += valid @ matrix
+        if targeting:
+            target += (valid * (matrix @ hits)) @ matrix
+    return hunt, target
+
+
+def _window_sums(grid, length):
+    """Her satırda, her yatay başlangıç için length uzunluğundaki pencere toplamı"""
+    sums = np.cumsum(np.pad(grid, ((0, 0), (1, 0))), axis=1)
+    return sums[:, length:] - sums[:, :-length]
+
+
+def _spread(starts, length):
+    """_window_sums'ın tersi: her başlangıç değerini kapladığı length hücreye ekler"""
+    return _window_sums(np.pad(starts, ((0, 0), (length - 1, length - 1))), length)
+
+
+def _window_density(blocked, hits, ship_sizes, board_size):
+    # Satırlar yatay, devrik ızgaranın satırları dikey yerleşimlerdir
+    blocked = blocked.reshape(board_size, board_size).astype(float)
+    hits = hits.reshape(board_size, board_size).astype(float)
+    blocked = np.concatenate([blocked, blocked.T])
+    hits = np.concatenate([hits, hits.T])
+    targeting = hits.any()
+
+    hunt = np.zeros_like(blocked)
+    target = np.zeros_like(blocked)
+    for size in ship_sizes:
+        valid = _window_sums(blocked, size) == 0
+        hunt += _spread(valid.astype(float), size)
+        if targeting:
+            target += _spread(valid * _window_sums(hits, size), size)
+    hunt = hunt[:board_size] + hunt[board_size:].T
+    target = target[:board_size] + target[board_size:].T
+    return hunt.flatten(), target.flatten()
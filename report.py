@@ -1,19 +1,14 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+# Çizim kütüphaneleri, yalnızca onları kullanan fonksiyonların içinde yüklenir;
+# böylece tek bir şekil üretmek tüm bilimsel yığının yüklenmesini gerektirmez
+import argparse
+import hashlib
 import json
-from scipy import stats
+import multiprocessing
 import os
-from matplotlib.patches import Circle, RegularPolygon
-from matplotlib.path import Path
-from matplotlib.projections.polar import PolarAxes
-from matplotlib.projections import register_projection
-from matplotlib.spines import Spine
-from matplotlib.transforms import Affine2D
-import pandas as pd
-from sklearn.tree import DecisionTreeClassifier, plot_tree
-from sklearn.preprocessing import LabelEncoder
-import networkx as nx
+import sys
+from functools import lru_cache
+
+import numpy as np
 
 def load_results(filename='simulation_results.json'):
     """JSON dosyasından simülasyon sonuçlarını yükle"""
@@ -29,6 +24,9 @@ def load_results(filename='simulation_results.json'):
 
 def set_style():
     """Grafik stilini ayarla"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Profesyonel renk paleti
     colors = ['#2ecc71', '#3498db', '#e74c3c', '#f1c40f', '#9b59b6', '#1abc9c']
     
@@ -54,6 +52,8 @@ def set_style():
 
 def analyze_win_stats(results):
     """Analyzes and visualizes win rates between AIs"""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(15, 8))
     
     # Calculate total win rate for each AI
@@ -87,6 +87,8 @@ def analyze_win_stats(results):
 
 def analyze_accuracy(results):
     """Analyzes and visualizes hit rates"""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(15, 8))
     
     matches = []
@@ -117,6 +119,8 @@ def analyze_accuracy(results):
 
 def analyze_moves(results):
     """Analyzes and visualizes move count distribution"""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(15, 8))
     
     matches = []
@@ -139,6 +143,8 @@ def analyze_moves(results):
 
 def analyze_accuracy_correlation(results):
     """Analyzes correlation between hit rate and win rate"""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 8))
     
     win_rates = []
@@ -167,6 +173,10 @@ def analyze_accuracy_correlation(results):
 
 def radar_factory(num_vars, frame='circle'):
     """Radar grafiği için özel projeksiyon oluşturur"""
+    from matplotlib.path import Path
+    from matplotlib.projections import register_projection
+    from matplotlib.projections.polar import PolarAxes
+
     theta = np.linspace(0, 2*np.pi, num_vars, endpoint=False)
     
     class RadarTransform(PolarAxes.PolarTransform):
@@ -194,22 +204,26 @@ def radar_factory(num_vars, frame='circle'):
     register_projection(RadarAxes)
     return theta
 
-def analyze_complexity(results):
-    """Shows AI complexity analysis using radar chart"""
+def analyze_complexity(metrics):
+    """Shows measured AI complexity (benchmark.py --profile-ai) using radar chart"""
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 8))
     
-    # Complexity metrics
-    categories = ['Time Complexity', 'Space Complexity', 'Decision Complexity']
+    # Ölçülen metrikler: süre (p50), hamle başına ayrılan bellek ve fonksiyon çağrısı sayısı
+    categories = ['Time Complexity\n(p50 ms/move)', 'Space Complexity\n(bytes allocated/move)',
+                  'Decision Complexity\n(calls/move)']
+    measured = {ai: [data['time_ms']['p50'], data['alloc_bytes']['mean'], data['calls_per_move']]
+                for ai, data in metrics['ai'].items()}
     N = len(categories)
     theta = np.linspace(0, 2*np.pi, N, endpoint=False)
     
-    # Complexity values for each AI
-    complexity_data = {
-        'random': [1, 1, 1],
-        'bfs': [3, 2, 2],
-        'greedy': [2, 2, 3],
-        'monte_carlo': [4, 3, 4]
-    }
+    # Değerler AI'lar arasında birkaç büyüklük mertebesine yayılır: her eksen log ölçekte 1-5 arasına çekilir
+    logs = np.log10(np.maximum(np.array(list(measured.values()), dtype=float), 1e-9))
+    low, high = logs.min(axis=0), logs.max(axis=0)
+    span = np.where(high > low, high - low, 1)
+    scaled = np.where(high > low, 1 + 4 * (logs - low) / span, 3)
+    complexity_data = dict(zip(measured, scaled))
     
     # Create radar chart
     ax = plt.subplot(111, polar=True)
@@ -225,7 +239,10 @@ def analyze_complexity(results):
     # Set axes
     ax.set_xticks(theta)
     ax.set_xticklabels(categories)
-    ax.set_title('Figure 5: AI Complexity Analysis')
+    ax.set_ylim(0, 5)
+    ax.set_yticks([1, 3, 5])
+    ax.set_yticklabels(['lowest', '', 'highest (log scale)'])
+    ax.set_title('Figure 5: AI Complexity Analysis (measured)')
     ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
     
     plt.tight_layout()
@@ -234,6 +251,9 @@ def analyze_complexity(results):
 
 def analyze_decision_strategies():
     """Shows decision-making processes of AI strategies"""
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
     plt.figure(figsize=(20, 15))
     
     # Create decision tree for each AI
@@ -285,6 +305,9 @@ def analyze_decision_strategies():
 
 def create_league_table(results):
     """Shows performance summary of AIs in table format"""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
     plt.figure(figsize=(15, 8))
     
     # Collect data
@@ -328,34 +351,206 @@ def create_league_table(results):
     plt.savefig('figures/league_table.png')
     plt.close()
 
+def create_latency_table(metrics):
+    """Shows measured per-move latency and resource use of each AI in table format"""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(15, 6))
+
+    columns = ['p50 (ms)', 'p90 (ms)', 'p99 (ms)', 'Mean (ms)', 'Alloc/move (KiB)', 'Peak RSS (MiB)', 'Calls/move']
+    rows = []
+    for data in metrics['ai'].values():
+        timing = data['time_ms']
+        rows.append([f"{timing['p50']:.3f}", f"{timing['p90']:.3f}", f"{timing['p99']:.3f}", f"{timing['mean']:.3f}",
+                     f"{data['alloc_bytes']['mean'] / 1024:.1f}", f"{data['peak_rss_kib'] / 1024:.1f}",
+                     f"{data['calls_per_move']:.0f}"])
+
+    plt.table(cellText=rows,
+              rowLabels=list(metrics['ai']),
+              colLabels=columns,
+              cellLoc='center',
+              loc='center')
+
+    corpus = metrics['corpus']
+    plt.title('Table II: AI Move Latency')
+    plt.figtext(0.5, 0.05, f"decide() over {corpus['num_boards']} fixed boards x {corpus['repeat']} repeats "
+                           f"(seed {corpus['seed']}), benchmark.py --profile-ai", ha='center')
+    plt.axis('off')
+
+    plt.tight_layout()
+    plt.savefig('figures/latency_table.png')
+    plt.close()
+
+# Rapor şekilleri: ad -> (çizim fonksiyonu, çıktı dosyası, girdi, açıklama); girdi "results" (simülasyon
+# sonuçları), "metrics" (benchmark.py --profile-ai ölçümleri) ya da None
+FIGURES = {
+    'win_stats': (analyze_win_stats, 'figures/win_stats.png', 'results', "AI Kazanma Oranları"),
+    'hit_rates': (analyze_accuracy, 'figures/hit_rates.png', 'results', "AI İsabet Oranları"),
+    'move_distribution': (analyze_moves, 'figures/move_distribution.png', 'results', "Hamle Sayısı Dağılımı"),
+    'accuracy_correlation': (analyze_accuracy_correlation, 'figures/accuracy_correlation.png', 'results',
+                             "İsabet Oranı vs Kazanma Oranı Korelasyonu"),
+    'complexity_radar': (analyze_complexity, 'figures/complexity_radar.png', 'metrics', "AI Karmaşıklık Analizi"),
+    'decision_strategies': (analyze_decision_strategies, 'figures/decision_strategies.png', None,
+                            "AI Karar Stratejileri"),
+    'league_table': (create_league_table, 'figures/league_table.png', 'results', "AI Performans Özeti"),
+    'latency_table': (create_latency_table, 'figures/latency_table.png', 'metrics', "AI Hamle Gecikmesi"),
+}
+MANIFEST = 'figures/manifest.json'
+
+
+def file_hash(filename):
+    """Dosya içeriğinin SHA-256 özeti"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def figure_key(name, input_hashes):
+    """Bir şeklin girdi dosyası ve report.py kaynak özeti; ikisi de değişmediyse PNG yeniden çizilmez"""
+    _, _, source, _ = FIGURES[name]
+    return {
+        'input': input_hashes[source] if source else None,
+        'code': code_hash(),
+    }
+
+
+@lru_cache(maxsize=None)
+def code_hash():
+    """report.py kaynağının özeti; şekil fonksiyonları ve ortak yardımcılar birlikte sürümlenir"""
+    return file_hash(__file__)
+
+
+def load_manifest(filename=MANIFEST):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, filename=MANIFEST):
+    # Yarım yazılmış bir manifest bir sonraki çalıştırmada her şeyi bayat göstermesin
+    temporary = filename + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(temporary, filename)
+
+
+def stale_figures(input_hashes, manifest, names=FIGURES):
+    """PNG'si olmayan ya da girdi/kod özeti manifest'tekinden farklı şekiller"""
+    stale = []
+    for name in names:
+        output = FIGURES[name][1]
+        if not os.path.exists(output) or manifest.get(name) != figure_key(name, input_hashes):
+            stale.append(name)
+    return stale
+
+
+def load_metrics(filename='ai_metrics.json'):
+    """benchmark.py --profile-ai'ın yazdığı ölçüm dosyasını yükle"""
+    with open(filename) as f:
+        return json.load(f)
+
+
+def render_figure(task):
+    """Tek bir şekli çizer; süreç havuzu işçilerinde çalışır ve (ad, hata ya da None) döndürür"""
+    name, inputs = task
+    import matplotlib
+    matplotlib.use('Agg')  # İşçiler ekran açmaz
+    import matplotlib.pyplot as plt
+
+    function, _, source, _ = FIGURES[name]
+    try:
+        if source == 'results':
+            function(load_results(inputs['results']))
+        elif source == 'metrics':
+            function(load_metrics(inputs['metrics']))
+        else:
+            function()
+    except Exception as error:
+        # Bir şeklin hatası (ör. eksik networkx/pandas) diğer şekilleri durdurmasın
+        plt.close('all')
+        return name, f"{type(error).__name__}: {error}"
+    return name, None
+
+
+def build_report(results_filename='simulation_results.json', workers=None, force=False, names=FIGURES,
+                 metrics_filename='ai_metrics.json'):
+    """Bayat şekilleri süreç havuzunda çizer; (çizilen, çizilemeyen, ölçüm dosyası eksik) adları döndürür"""
+    os.makedirs('figures', exist_ok=True)
+    inputs = {'results': results_filename, 'metrics': metrics_filename}
+    missing = []
+    if not os.path.exists(metrics_filename):
+        missing = [name for name in names if FIGURES[name][2] == 'metrics']
+        if missing:
+            print(f"{metrics_filename} yok, atlandı: {', '.join(missing)} (önce: python benchmark.py --profile-ai)")
+        names = [name for name in names if name not in missing]
+        del inputs['metrics']
+    input_hashes = {source: file_hash(filename) for source, filename in inputs.items()}
+    manifest = {} if force else load_manifest()
+    stale = stale_figures(input_hashes, manifest, names)
+    if not stale:
+        return [], [], missing
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    tasks = [(name, inputs) for name in stale]
+    if workers == 1:
+        finished = map(render_figure, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        finished = pool.imap_unordered(render_figure, tasks)
+
+    rendered, failed = [], []
+    try:
+        for name, error in finished:
+            if error is not None:
+                failed.append(name)
+                print(f"{FIGURES[name][1]} çizilemedi: {error}")
+                continue
+            rendered.append(name)
+            manifest[name] = figure_key(name, input_hashes)
+            save_manifest(manifest)
+            print(f"{FIGURES[name][1]} çizildi")
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return rendered, failed, missing
+
+
 def main():
-    """Ana fonksiyon - tüm analizleri çalıştırır"""
+    """Ana fonksiyon - bayat analizleri yeniden çizer"""
+    parser = argparse.ArgumentParser(description="AI Savaş Simülasyonu Raporu")
+    parser.add_argument('names', nargs='*', default=list(FIGURES),
+                        help=f"çizilecek şekiller: {', '.join(FIGURES)} (varsayılan: hepsi)")
+    parser.add_argument('--results', default='simulation_results.json', help="simülasyon sonuç dosyası")
+    parser.add_argument('--metrics', default='ai_metrics.json',
+                        help="benchmark.py --profile-ai ile yazılan AI ölçüm dosyası")
+    parser.add_argument('--workers', type=int, default=None, help="işçi süreç sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument('--force', action='store_true', help="değişmemiş şekilleri de yeniden çiz")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in FIGURES]
+    if unknown:
+        parser.error(f"bilinmeyen şekil: {', '.join(unknown)}")
+
     print("AI Savaş Simülasyonu Raporu oluşturuluyor...")
-    
-    # figures klasörünü oluştur
-    if not os.path.exists('figures'):
-        os.makedirs('figures')
-    
-    # Simülasyon sonuçlarını yükle
-    results = load_results('simulation_results.json')
-    
-    # Analizleri çalıştır
-    analyze_win_stats(results)
-    analyze_accuracy(results)
-    analyze_moves(results)
-    analyze_accuracy_correlation(results)
-    analyze_complexity(results)
-    analyze_decision_strategies()
-    create_league_table(results)
-    
-    print("\nAnalizler tamamlandı. Oluşturulan PNG dosyaları:")
-    print("1. figures/win_stats.png - AI Kazanma Oranları")
-    print("2. figures/hit_rates.png - AI İsabet Oranları")
-    print("3. figures/move_distribution.png - Hamle Sayısı Dağılımı")
-    print("4. figures/accuracy_correlation.png - İsabet Oranı vs Kazanma Oranı Korelasyonu")
-    print("5. figures/complexity_radar.png - AI Karmaşıklık Analizi")
-    print("6. figures/decision_strategies.png - AI Karar Stratejileri")
-    print("7. figures/league_table.png - AI Performans Özeti")
+    rendered, failed, missing = build_report(args.results, workers=args.workers, force=args.force,
+                                             names=args.names, metrics_filename=args.metrics)
+    up_to_date = [name for name in args.names if name not in rendered + failed + missing]
+    if up_to_date:
+        print(f"{len(up_to_date)} şekil güncel, atlandı")
+
+    print("\nAnalizler tamamlandı. PNG dosyaları:")
+    produced = [name for name in args.names if name in rendered or name in up_to_date]
+    for number, name in enumerate(produced, start=1):
+        _, output, _, description = FIGURES[name]
+        print(f"{number}. {output} - {description}")
+    if missing:
+        print(f"\n{len(missing)} şekil ölçüm dosyası olmadığı için çizilmedi: {', '.join(missing)}")
+    if failed:
+        print(f"\n{len(failed)} şekil çizilemedi: {', '.join(failed)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
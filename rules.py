@@ -0,0 +1,43 @@
+from collections import namedtuple
+
+
+class Rules(namedtuple("Rules", ["size", "fleet"])):
+    """Oyun kuralları: kare tahtanın kenar uzunluğu ve filodaki gemi boyları.
+
+    Rules are immutable and hashable, so they can key the cached
+    placement and geometry tables. ``Rules()`` is the classic 10x10 board
+    with the 5, 4, 3, 3, 2 fleet.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, size=10, fleet=(5, 4, 3, 3, 2)):
+        fleet = tuple(fleet)
+        if size < 1:
+            raise ValueError(f"board size must be positive, got {size}")
+        if not fleet or any(ship < 1 or ship > size for ship in fleet):
+            raise ValueError(f"every ship must fit on a {size}x{size} board: {fleet}")
+        if sum(fleet) > size * size:
+            raise ValueError(f"fleet {fleet} has more cells than a {size}x{size} board")
+        return super().__new__(cls, size, fleet)
+
+    @property
+    def cells(self):
+        return self.size * self.size
+
+    @property
+    def full_mask(self):
+        return (1 << self.cells) - 1
+
+    @property
+    def center(self):
+        """Merkez koordinatı (10x10 için 4.5)"""
+        return (self.size - 1) / 2
+
+    @property
+    def center_range(self):
+        """Merkezdeki 4x4 bloğun satır/sütun aralığı (10x10 için 3..6)"""
+        return range(max(0, self.size // 2 - 2), min(self.size, self.size // 2 + 2))
+
+
+DEFAULT_RULES = Rules()
@@ -1,11 +1,27 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
 import random
-from engine import Game
+import zlib
+from collections import namedtuple
+from functools import partial
+
 import numpy as np
-import json
 
-def play_game(ai1_type, ai2_type):
-    """İki AI arasında bir oyun oynar ve sonuçları döndürür"""
-    game = Game(human1=False, human2=False, ai_type=ai1_type, ai_type2=ai2_type)
+from batch import wilson_interval
+from engine import Game, Player
+from instruments import Instruments
+from rules import DEFAULT_RULES, Rules
+
+def play_game(ai1_type, ai2_type, rules=DEFAULT_RULES, instruments=None, rng=None, fleets=None, play_out=False):
+    """İki AI arasında bir oyun oynar ve sonuçları döndürür; instruments verilirse tur bölümleri ölçülür.
+
+    rng oyunun Random'ı, fleets iki oyuncunun yerleşimidir; play_out=True ise bitirme atışları da döner.
+    """
+    game = Game(human1=False, human2=False, ai_type=ai1_type, ai_type2=ai2_type, rules=rules,
+                instruments=instruments, rng=rng, fleets=fleets)
     moves = 0
     hits = 0
     first_ai_hits = 0
@@ -18,35 +34,34 @@ def play_game(ai1_type, ai2_type):
     second_ai_scores = None
     
     while not game.over:
-        # Hamle öncesi skor matrisini kaydet
+        # Kararı bir kez hesapla; hamle de skor matrisi de aynı karardan gelir
+        decision = game.decide()
         if game.player1_turn:
-            if ai1_type in ["greedy", "monte_carlo"]:
-                first_ai_scores = game.get_ai_scores(1)  # Player 1'in skor matrisi
+            if decision.scores is not None:
+                first_ai_scores = decision.scores  # Player 1'in skor matrisi
             first_ai_shots += 1
         else:
-            if ai2_type in ["greedy", "monte_carlo"]:
-                second_ai_scores = game.get_ai_scores(2)  # Player 2'nin skor matrisi
+            if decision.scores is not None:
+                second_ai_scores = decision.scores  # Player 2'nin skor matrisi
             second_ai_shots += 1
         
-        game.ai_move()
+        game.ai_move(decision)
         moves += 1
         
-        # İsabet istatistiklerini kaydet
+        # İsabet istatistiklerini kaydet (tahtada "H" olarak duran kare sayısı)
         if game.player1_turn:
-            for i in range(100):
-                if game.player2.search[i] == "H":
-                    hits += 1
-                    first_ai_hits += 1
+            board_hits = bin(game.player2.search.hits).count("1")
+            hits += board_hits
+            first_ai_hits += board_hits
         else:
-            for i in range(100):
-                if game.player1.search[i] == "H":
-                    hits += 1
-                    second_ai_hits += 1
+            board_hits = bin(game.player1.search.hits).count("1")
+            hits += board_hits
+            second_ai_hits += board_hits
     
     # Kazananı belirle
     winner = ai1_type if game.result == "1" else ai2_type
     
-    return {
+    result = {
         'winner': winner,
         'moves': moves,
         'hits': hits,
@@ -55,85 +70,568 @@ def play_game(ai1_type, ai2_type):
         'second_ai_hits': second_ai_hits,
         'second_ai_shots': second_ai_shots,
         'first_ai_scores': first_ai_scores.tolist() if first_ai_scores is not None else None,
-        'second_ai_scores': second_ai_scores.tolist() if second_ai_scores is not None else None
+        'second_ai_scores': second_ai_scores.tolist() if second_ai_scores is not None else None,
+        # GUI'nin yeniden oynatma modu için filolar ve hamleler
+        'log': game.move_log()
     }
+    if play_out:
+        result['first_ai_shots_to_finish'], result['second_ai_shots_to_finish'] = play_out_game(game)
+    return result
 
-def run_simulation():
-    """Simülasyonu çalıştırır ve sonuçları kaydeder"""
-    results = {}
-    ai_types = ["random", "bfs", "monte_carlo", "greedy"]
-    num_games = 100  # Her eşleşme için oynanacak oyun sayısı
-    
+
+def play_out_game(game):
+    """Biten oyunda her oyuncunun rakip filoyu batırmak için gereken atış sayısı: (player 1, player 2).
+
+    Kaybeden filoyu batırana kadar tek başına oynar; oyunun kazananı ve hamle kaydı önce okunmalıdır.
+    """
+    loser_is_player1 = game.result == "2"
+    # Oyun bittikten sonraki atışlar gerçek tur değildir; bölüm ölçümlerine girmesinler
+    instruments, game.instruments = game.instruments, None
+    game.over = False
+    while not game.over:
+        game.player1_turn = loser_is_player1
+        game.ai_move()
+    game.instruments = instruments
+    return bin(game.player1.search.shots).count("1"), bin(game.player2.search.shots).count("1")
+
+AI_TYPES = ["random", "bfs", "monte_carlo", "greedy", "probability"]
+SCORED_AI_TYPES = ["greedy", "monte_carlo", "probability"]
+# Eşli turnuvada filo derlemi tüm eşleşmelerde ortaktır; tohumları bu anahtarla türetilir
+FLEET_CORPUS_KEY = "paired fleets"
+# Oyuncuya göre tutulan sonuç alanları; kenarları değişen oyunlarda first/second yer değiştirir
+SIDE_FIELDS = ('hits', 'shots', 'scores', 'shots_to_finish')
+
+
+def game_seed(base_seed, match_key, game_index):
+    """Eşleşme ve oyun indeksinden çalışan sayısından bağımsız, sabit bir tohum türetir"""
+    entropy = [base_seed, zlib.crc32(match_key.encode()), game_index]
+    return int(np.random.SeedSequence(entropy).generate_state(1)[0])
+
+
+def play_seeded_game(unit, instrument=False):
+    """Bir iş birimini oynar ve oyun kaydını döndürür; havuz işçilerinde çalışır.
+
+    swapped oyunda ai2 birinci oyuncudur (kayıt alanları yine ai1/ai2'ye göre); instrument=True ise 'spans' eklenir.
+    """
+    match_key, ai1, ai2, game_index, seed, rules, swapped = unit
+    instruments = Instruments() if instrument else None
+    rng = random.Random(seed)
+    if swapped is None:
+        game_result = play_game(ai1, ai2, rules, instruments, rng)
+    else:
+        # Filolar, eşsiz bir oyunun kendi tohumundan çektiği filolarla aynıdır; kararlar aynı akıştan devam eder
+        fleets = [Player(rules, rng=rng).layout() for _ in range(2)]
+        if swapped:
+            game_result = swap_sides(play_game(ai2, ai1, rules, instruments, rng, fleets, play_out=True))
+        else:
+            game_result = play_game(ai1, ai2, rules, instruments, rng, fleets, play_out=True)
+    record = game_record(match_key, ai1, ai2, game_index, seed, rules, game_result)
+    if swapped is not None:
+        record['swapped'] = swapped
+    if instruments is not None:
+        record['spans'] = instruments.snapshot()
+    return record
+
+
+def swap_sides(game_result):
+    """play_game sonucunu, oyuncuların yerleri değişmiş gibi first/second alanları takas edilmiş olarak döndürür"""
+    swapped = dict(game_result)
+    for field in SIDE_FIELDS:
+        swapped[f'first_ai_{field}'] = game_result[f'second_ai_{field}']
+        swapped[f'second_ai_{field}'] = game_result[f'first_ai_{field}']
+    return swapped
+
+
+def tournament_pairings(ai_types):
+    """Turnuvadaki (eşleşme anahtarı, ai1, ai2) üçlüleri, sabit sırayla"""
+    pairings = []
     for ai1 in ai_types:
         for ai2 in ai_types:
             if ai1 < ai2:  # Aynı AI'ların kendisiyle eşleşmesini engelle
-                match_key = f"{ai1} vs {ai2}"
-                print(f"\nSimülasyon başlıyor: {match_key}")
-                
-                # Her eşleşme için num_games kadar oyun oyna
-                wins = 0
-                moves_list = []
-                total_shots = 0
-                hits = 0
-                first_ai_hits = 0
-                first_ai_shots = 0
-                second_ai_hits = 0
-                second_ai_shots = 0
-                first_ai_score_sum = np.zeros((10, 10)) if ai1 in ["greedy", "monte_carlo"] else None
-                second_ai_score_sum = np.zeros((10, 10)) if ai2 in ["greedy", "monte_carlo"] else None
-                
-                for game in range(num_games):
-                    print(f"Oyun {game + 1}/{num_games}...")
-                    game_result = play_game(ai1, ai2)
-                    
-                    if game_result['winner'] == ai1:
-                        wins += 1
-                    
-                    moves_list.append(game_result['moves'])
-                    total_shots += game_result['moves']
-                    hits += game_result['hits']
-                    first_ai_hits += game_result['first_ai_hits']
-                    first_ai_shots += game_result['first_ai_shots']
-                    second_ai_hits += game_result['second_ai_hits']
-                    second_ai_shots += game_result['second_ai_shots']
-                    
-                    # Skor matrislerini topla
-                    if game_result['first_ai_scores'] is not None:
-                        first_ai_score_sum += np.array(game_result['first_ai_scores'])
-                    if game_result['second_ai_scores'] is not None:
-                        second_ai_score_sum += np.array(game_result['second_ai_scores'])
-                
-                # Sonuçları kaydet
-                results[match_key] = {
-                    'wins': wins,
-                    'total_games': num_games,
-                    'win_rate': (wins / num_games) * 100,
-                    'avg_moves': sum(moves_list) / len(moves_list),
-                    'move_counts': moves_list,
-                    'total_shots': total_shots,
-                    'hits': hits,
-                    'accuracy': (hits / total_shots * 100) if total_shots > 0 else 0,
-                    'first_ai_hits': first_ai_hits,
-                    'first_ai_shots': first_ai_shots,
-                    'first_ai_accuracy': (first_ai_hits / first_ai_shots * 100) if first_ai_shots > 0 else 0,
-                    'second_ai_hits': second_ai_hits,
-                    'second_ai_shots': second_ai_shots,
-                    'second_ai_accuracy': (second_ai_hits / second_ai_shots * 100) if second_ai_shots > 0 else 0
-                }
-                
-                # Skor matrislerini ortalama alarak kaydet
-                if first_ai_score_sum is not None:
-                    results[match_key]['first_ai_score_matrix'] = (first_ai_score_sum / num_games).tolist()
-                if second_ai_score_sum is not None:
-                    results[match_key]['second_ai_score_matrix'] = (second_ai_score_sum / num_games).tolist()
-    
-    # Sonuçları JSON dosyasına kaydet
-    with open('simulation_results.json', 'w') as f:
-        json.dump(results, f, indent=4)
-    
-    print("\nSimülasyon tamamlandı. Sonuçlar simulation_results.json dosyasına kaydedildi.")
+                pairings.append((f"{ai1} vs {ai2}", ai1, ai2))
+    return pairings
+
+
+def pairing_units(pairing, start, stop, base_seed, rules=DEFAULT_RULES, paired=False):
+    """Bir eşleşmenin start..stop-1 oyunlarının (match, ai1, ai2, game, seed, rules, swapped) birimleri.
+
+    paired=True ise 2k ve 2k+1 oyunları ortak filo derleminin k. tohumunu paylaşır, 2k+1'de yerler değişir.
+    """
+    match_key, ai1, ai2 = pairing
+    if not paired:
+        return [(match_key, ai1, ai2, game_index, game_seed(base_seed, match_key, game_index), rules, None)
+                for game_index in range(start, stop)]
+    return [(match_key, ai1, ai2, game_index, game_seed(base_seed, FLEET_CORPUS_KEY, game_index // 2), rules,
+             game_index % 2 == 1)
+            for game_index in range(start, stop)]
+
+
+def tournament_units(ai_types, num_games, base_seed, rules=DEFAULT_RULES, paired=False):
+    """Turnuvadaki tüm (eşleşme, oyun) birimlerini sabit sırayla üretir"""
+    units = []
+    for pairing in tournament_pairings(ai_types):
+        units.extend(pairing_units(pairing, 0, num_games, base_seed, rules, paired))
+    return units
+
+
+# Sıralı test ile erken durdurma ayarları; method "sprt" ya da "ci"
+StopRule = namedtuple("StopRule", ["method", "batch_size", "max_games", "budget", "delta", "alpha", "beta", "ci_width"],
+                      defaults=("sprt", 10, None, None, 0.1, 0.05, 0.05, 0.1))
+
+
+def stop_reason(rule, wins, games, interval=None):
+    """Eşleşme durdurulabiliyorsa nedeni ("sprt" ya da "ci_width"), yoksa None.
+
+    sprt ai1 kazanma oranı için Wald testidir (0.5 ± delta); ci, Wilson aralığı ya da verilen interval
+    ci_width'e inince durdurur.
+    """
+    if games == 0:
+        return None
+    if rule.method == "sprt":
+        step = math.log((0.5 + rule.delta) / (0.5 - rule.delta))
+        llr = wins * step - (games - wins) * step
+        if llr >= math.log((1 - rule.beta) / rule.alpha) or llr <= math.log(rule.beta / (1 - rule.alpha)):
+            return "sprt"
+        return None
+    low, high = wilson_interval(wins, games) if interval is None else interval
+    return "ci_width" if high - low <= rule.ci_width else None
+
+
+def adaptive_rounds(pairings, matches, stop_reasons, rule, num_games, base_seed, rules=DEFAULT_RULES, paired=False):
+    """Erken durdurmalı turnuvanın birim turlarını üretir; süren eşleşmeler tur başına batch_size oyun alır.
+
+    Bütçe süren eşleşmelerce paylaşılır; nedenler stop_reasons'a yazılır, eşli turnuvada sayılar çifttir.
+    """
+    step = 2 if paired else 1
+    budget = rule.budget if rule.budget is not None else num_games * len(pairings)
+    max_games = rule.max_games if rule.max_games is not None else budget
+    played = {match_key: 0 for match_key, _, _ in pairings}
+    active = list(pairings)
+    while active:
+        remaining = (budget - sum(played.values())) // step
+        if remaining <= 0:
+            for match_key, _, _ in active:
+                stop_reasons[match_key] = "budget"
+            return
+        share, extra = divmod(remaining, len(active))
+        round_units = []
+        for position, pairing in enumerate(active):
+            match_key = pairing[0]
+            count = step * min(max(rule.batch_size // step, 1), share + (position < extra),
+                               (max_games - played[match_key]) // step)
+            round_units.extend(pairing_units(pairing, played[match_key], played[match_key] + count,
+                                             base_seed, rules, paired))
+            played[match_key] += count
+        yield round_units
+
+        still_running = []
+        for pairing in active:
+            match_key = pairing[0]
+            match = matches.get(match_key)
+            reason = stop_reason(rule, match.wins, match.num_games, match.paired_interval()) if match else None
+            if reason is None and played[match_key] + step > max_games:
+                reason = "max_games"
+            if reason is None:
+                still_running.append(pairing)
+            else:
+                stop_reasons[match_key] = reason
+                print(f"{match_key}: {played[match_key]} oyunda durdu ({reason})")
+        active = still_running
+
+
+class MatchSummary:
+    """Bir eşleşmenin özetini oyun oyun biriktirir; oyun kayıtlarını bellekte tutmaz"""
+
+    def __init__(self, ai1, ai2, rules=DEFAULT_RULES):
+        self.ai1 = ai1
+        self.ai2 = ai2
+        self.num_games = 0
+        self.wins = 0
+        self.moves_list = []
+        self.total_shots = 0
+        self.hits = 0
+        self.first_ai_hits = 0
+        self.first_ai_shots = 0
+        self.second_ai_hits = 0
+        self.second_ai_shots = 0
+        board_shape = (rules.size, rules.size)
+        self.first_ai_score_sum = np.zeros(board_shape) if ai1 in SCORED_AI_TYPES else None
+        self.second_ai_score_sum = np.zeros(board_shape) if ai2 in SCORED_AI_TYPES else None
+        # Eşli oyunlar: tamamlanan her çiftin ai1 puanı (0, 0.5 ya da 1), her filoda
+        # (ai1, ai2) bitirme atışları ve eşini bekleyen ilk oyunlar
+        self.pair_scores = []
+        self.fleet_shots = []
+        self._open_pairs = {}
+
+    def add(self, game_result):
+        self.num_games += 1
+        won = game_result['winner'] == self.ai1
+        if won:
+            self.wins += 1
+        if game_result.get('swapped') is not None:
+            self.add_paired(game_result, won)
+
+        self.moves_list.append(game_result['moves'])
+        self.total_shots += game_result['moves']
+        self.hits += game_result['hits']
+        self.first_ai_hits += game_result['first_ai_hits']
+        self.first_ai_shots += game_result['first_ai_shots']
+        self.second_ai_hits += game_result['second_ai_hits']
+        self.second_ai_shots += game_result['second_ai_shots']
+
+        # Skor matrislerini topla
+        if game_result['first_ai_scores'] is not None:
+            self.first_ai_score_sum += np.array(game_result['first_ai_scores'])
+        if game_result['second_ai_scores'] is not None:
+            self.second_ai_score_sum += np.array(game_result['second_ai_scores'])
+
+    def add_paired(self, game_result, won):
+        """Eşli bir oyunu eşiyle birleştirir; çift tamamlanınca puanı ve filo atışları eklenir"""
+        pair = game_result['game'] // 2
+        game = (won, game_result['swapped'],
+                game_result['first_ai_shots_to_finish'], game_result['second_ai_shots_to_finish'])
+        other = self._open_pairs.pop(pair, None)
+        if other is None:
+            self._open_pairs[pair] = game
+            return
+        self.pair_scores.append((other[0] + won) / 2)
+        # Düz oyunda ai1 ikinci filoya, ai2 birinci filoya ateş eder; yer değişince tersi
+        straight, swapped = (other, game) if game[1] else (game, other)
+        self.fleet_shots.append((swapped[2], straight[3]))
+        self.fleet_shots.append((straight[2], swapped[3]))
+
+    def summary(self):
+        num_games = self.num_games
+        summary = {
+            'wins': self.wins,
+            'total_games': num_games,
+            'win_rate': (self.wins / num_games) * 100,
+            'avg_moves': sum(self.moves_list) / len(self.moves_list),
+            'move_counts': list(self.moves_list),
+            'total_shots': self.total_shots,
+            'hits': self.hits,
+            'accuracy': (self.hits / self.total_shots * 100) if self.total_shots > 0 else 0,
+            'first_ai_hits': self.first_ai_hits,
+            'first_ai_shots': self.first_ai_shots,
+            'first_ai_accuracy': (self.first_ai_hits / self.first_ai_shots * 100) if self.first_ai_shots > 0 else 0,
+            'second_ai_hits': self.second_ai_hits,
+            'second_ai_shots': self.second_ai_shots,
+            'second_ai_accuracy': (self.second_ai_hits / self.second_ai_shots * 100) if self.second_ai_shots > 0 else 0
+        }
+
+        # Skor matrislerini ortalama alarak kaydet
+        if self.first_ai_score_sum is not None:
+            summary['first_ai_score_matrix'] = (self.first_ai_score_sum / num_games).tolist()
+        if self.second_ai_score_sum is not None:
+            summary['second_ai_score_matrix'] = (self.second_ai_score_sum / num_games).tolist()
+
+        if self.pair_scores:
+            summary['paired'] = self.paired_summary()
+
+        return summary
+
+    def paired_interval(self):
+        """Çapraz kazanma oranının etkin oyun sayısı üzerinden %95 Wilson aralığı (oran olarak); iki çiftten azsa None"""
+        estimate = self.crossed_estimate()
+        if estimate is None:
+            return None
+        rate, std_error = estimate
+        games = self.effective_games(rate, std_error)
+        return unit_interval(rate * games, games)
+
+    def effective_games(self, rate, std_error):
+        """Aynı kesinliği verecek bağımsız oyun sayısı; sonuç oybirliğiyse (hata 0) oynanan oyun sayısı"""
+        if std_error > 0 and 0 < rate < 1:
+            return rate * (1 - rate) / std_error ** 2
+        return len(self.fleet_shots)
+
+    def crossed_estimate(self):
+        """ai1'in çapraz kazanma oranı ve standart hatası (bitirme atışlarının U-istatistiği); iki çiftten azsa None"""
+        fleets = len(self.fleet_shots)
+        if fleets < 4:
+            return None
+        first, second = np.array(self.fleet_shots, dtype=float).T
+        first_sorted, second_sorted = np.sort(first), np.sort(second)
+
+        def wins(shots, opponent_sorted, fewer_wins):
+            # Her atış sayısının karşı taraftaki tüm sayılara karşı puanı: kazanç 1, beraberlik 0.5
+            below = np.searchsorted(opponent_sorted, shots, 'left')
+            above = fleets - np.searchsorted(opponent_sorted, shots, 'right')
+            ties = fleets - below - above
+            return (above if fewer_wins else below) + 0.5 * ties
+
+        own = (first < second) + 0.5 * (first == second)
+        first_scores = (wins(first, second_sorted, True) - own) / (fleets - 1)
+        second_scores = (wins(second, first_sorted, False) - own) / (fleets - 1)
+        rate = float(first_scores.mean())
+        std_error = float(np.std(first_scores + second_scores, ddof=1)) / math.sqrt(fleets)
+        return rate, std_error
+
+    def paired_summary(self):
+        """Eşli çiftlerin tahminleri: çift puanı, çapraz kazanma oranı ve aynı filodaki atış farkı"""
+        pairs = len(self.pair_scores)
+        mean = sum(self.pair_scores) / pairs
+        paired = {'pairs': pairs, 'win_rate': mean * 100,
+                  'split_pairs': sum(score == 0.5 for score in self.pair_scores)}
+        estimate = self.crossed_estimate()
+        if estimate is None:
+            return paired
+        games = 2 * pairs
+        rate, std_error = estimate
+        low, high = self.paired_interval()
+        pair_low, pair_high = unit_interval(mean * pairs, pairs)
+        unpaired = math.sqrt(rate * (1 - rate) / games)
+        effective = self.effective_games(rate, std_error)
+
+        first, second = np.array(self.fleet_shots, dtype=float).T
+        margins = second - first
+        margin_variance = float(np.var(margins, ddof=1))
+        margin_half = 1.96 * math.sqrt(margin_variance / len(margins))
+        unmatched_variance = float(np.var(first, ddof=1) + np.var(second, ddof=1))
+        paired.update({
+            'pair_ci95': [pair_low * 100, pair_high * 100],
+            'crossed_win_rate': rate * 100,
+            'ci95': [low * 100, high * 100],
+            'std_error': std_error * 100,
+            'unpaired_std_error': unpaired * 100,
+            'variance_reduction': effective / games,
+            'effective_games': effective,
+            'shot_margin': float(margins.mean()),
+            'shot_margin_ci95': [float(margins.mean()) - margin_half, float(margins.mean()) + margin_half],
+            'shot_margin_variance_reduction': unmatched_variance / margin_variance if margin_variance > 0 else None,
+        })
+        return paired
+
+
+def unit_interval(wins, games):
+    """[0, 1]'e kırpılmış Wilson aralığı; kesirli kazanç sayılarında yuvarlama sınırı aşmasın"""
+    low, high = wilson_interval(wins, games)
+    return max(0.0, low), min(1.0, high)
+
+
+def summarize_match(ai1, ai2, game_results, rules=DEFAULT_RULES):
+    """Bir eşleşmenin oyun sonuçlarını (oyun sırasıyla) özet sözlüğüne çevirir"""
+    match = MatchSummary(ai1, ai2, rules)
+    for game_result in game_results:
+        match.add(game_result)
+    return match.summary()
+
+
+def game_record(match_key, ai1, ai2, game_index, seed, rules, game_result):
+    """Akış dosyasına yazılan, kendi başına anlamlı tek oyunluk kayıt"""
+    return {'match': match_key, 'ai1': ai1, 'ai2': ai2, 'game': game_index, 'seed': seed,
+            'board_size': rules.size, 'fleet': list(rules.fleet), **game_result}
+
+
+def stop_record(match_key, reason, stop_rule):
+    """Erken durdurulan bir eşleşmenin akışa yazılan son kaydı: durma nedeni ve kuralın ayarları"""
+    return {'match': match_key, 'stop_reason': reason, 'stop_rule': stop_rule._asdict()}
+
+
+def read_game_records(games_filename, stops=False):
+    """Akış dosyasındaki oyun kayıtlarını sırayla üretir; stops=True ise eşleşmelerin durma kayıtlarını da.
+
+    Sonunda satır sonu olmayan satır, yazılırken kesilmiş bir kayıttır ve atlanır.
+    """
+    with open(games_filename) as f:
+        for line in f:
+            if line.endswith("\n"):
+                record = json.loads(line)
+                if stops or 'game' in record:
+                    yield record
+
+
+def aggregate_results(games_filename='simulation_games.jsonl'):
+    """Oyun kayıtları akışından run_simulation'ın özet sözlüğünü kurar; kayıtlar satır satır toplanır."""
+    matches = {}
+    stop_reasons = {}
+    for record in read_game_records(games_filename, stops=True):
+        if 'game' not in record:
+            stop_reasons[record['match']] = record['stop_reason']
+            continue
+        match = matches.get(record['match'])
+        if match is None:
+            rules = Rules(record['board_size'], record['fleet'])
+            match = matches[record['match']] = MatchSummary(record['ai1'], record['ai2'], rules)
+        match.add(record)
+    results = {}
+    for match_key, match in matches.items():
+        results[match_key] = match.summary()
+        if match_key in stop_reasons:
+            results[match_key]['stop_reason'] = stop_reasons[match_key]
+    return results
+
+
+class Checkpoint:
+    """Kesilmiş bir turnuvanın akış dosyası; kayıtlar planlanan oyunlar ve durma kayıtlarıyla sırayla eşleşir.
+
+    Başka bir turnuvanın kaydı ValueError verir; yazılırken kesilmiş son satır açılışta dosyadan kesilir.
+    """
+
+    def __init__(self, games_filename):
+        self.games_filename = games_filename
+        self.done = 0
+        self.lines = 0
+        complete_bytes = 0
+        with open(games_filename, 'rb') as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    complete_bytes += len(line)
+        with open(games_filename, 'r+b') as f:
+            f.truncate(complete_bytes)
+        self._file = open(games_filename, 'rb')
+
+    def take(self, unit):
+        """Returns the stored record for ``unit``, or None once the checkpoint is used up"""
+        record = self._next()
+        if record is None:
+            return None
+        match_key, _, _, game_index, seed, rules, swapped = unit
+        if (record['match'], record.get('game'), record.get('seed'), record.get('board_size'),
+                tuple(record.get('fleet', ())), record.get('swapped')) != \
+                (match_key, game_index, seed, rules.size, rules.fleet, swapped):
+            self._mismatch(f"{match_key} game {game_index}")
+        self.done += 1
+        return record
+
+    def take_stop(self, record):
+        """Returns True if the checkpoint holds this stop record next, False once it is used up"""
+        stored = self._next()
+        if stored is None:
+            return False
+        if stored != record:
+            self._mismatch(f"{record['match']} stopping by {record['stop_reason']}")
+        return True
+
+    def _next(self):
+        if self._file is None:
+            return None
+        line = self._file.readline()
+        if not line:
+            self.close()
+            return None
+        self.lines += 1
+        return json.loads(line)
+
+    def _mismatch(self, expected):
+        self.close()
+        raise ValueError(f"{self.games_filename} line {self.lines} does not match this tournament "
+                         f"(expected {expected})")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """Tüm birimler eşleştirildikten sonra dosyada fazladan kayıt kalmadığını doğrular"""
+        extra = self._file is not None and self._file.readline()
+        self.close()
+        if extra:
+            raise ValueError(f"{self.games_filename} has more games than this tournament")
+
+
+def run_simulation(num_games=100, workers=None, seed=0, ai_types=AI_TYPES, filename='simulation_results.json',
+                   rules=DEFAULT_RULES, games_filename='simulation_games.jsonl', resume=False, stop_rule=None,
+                   spans_filename=None, paired=False):
+    """Turnuvayı süreç havuzunda oynar; her oyun games_filename'e eklenir, özet filename'e kaydedilir.
+
+    resume kaldığı yerden sürdürür; stop_rule, spans_filename ve paired erken durdurma, ölçüm ve eşli turnuva içindir.
+    """
+    if paired and num_games % 2:
+        raise ValueError(f"a paired tournament plays whole pairs of games, got num_games={num_games}")
+    pairings = tournament_pairings(ai_types)
+    workers = workers or os.cpu_count() or 1
+    matches = {}
+    stop_reasons = {}
+    if stop_rule is None:
+        rounds = [tournament_units(ai_types, num_games, seed, rules, paired)]
+        print(f"{len(rounds[0])} oyun, {workers} işçi ile oynanıyor...")
+    else:
+        rounds = adaptive_rounds(pairings, matches, stop_reasons, stop_rule, num_games, seed, rules, paired)
+        print(f"Erken durdurmalı turnuva ({stop_rule.method}), {workers} işçi ile oynanıyor...")
+
+    checkpoint = Checkpoint(games_filename) if resume and os.path.exists(games_filename) else None
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    spans = Instruments() if spans_filename else None
+    play = partial(play_seeded_game, instrument=spans is not None)
+
+    def add(record):
+        match_key = record['match']
+        if match_key not in matches:
+            matches[match_key] = MatchSummary(record['ai1'], record['ai2'], rules)
+        matches[match_key].add(record)
+        if stop_rule is None and matches[match_key].num_games == num_games:
+            print(f"{match_key}: {num_games} oyun tamamlandı")
+
+    def write_stops(games_file):
+        # Yeni duran eşleşmelerin durma kayıtları, kayıttan devam ederken önce checkpoint'ten okunur
+        for match_key, reason in list(stop_reasons.items())[len(written_stops):]:
+            record = stop_record(match_key, reason, stop_rule)
+            if not (checkpoint and checkpoint.take_stop(record)):
+                games_file.write(json.dumps(record) + "\n")
+                games_file.flush()
+            written_stops.append(match_key)
+
+    written_stops = []
+    try:
+        with open(games_filename, 'a' if checkpoint else 'w') as games_file:
+            for units in rounds:
+                write_stops(games_file)
+                pending = []
+                for unit in units:
+                    record = checkpoint.take(unit) if checkpoint and not pending else None
+                    if record is None:
+                        pending.append(unit)
+                    else:
+                        add(record)
+
+                if pool is None:
+                    finished = map(play, pending)
+                else:
+                    finished = pool.imap(play, pending, chunksize=max(1, len(pending) // (workers * 32)))
+                for record in finished:
+                    if spans is not None:
+                        spans.merge(record.pop('spans'))
+                    games_file.write(json.dumps(record) + "\n")
+                    games_file.flush()
+                    add(record)
+            write_stops(games_file)
+
+            if checkpoint:
+                if checkpoint.done:
+                    print(f"{games_filename}: {checkpoint.done} oyun kayıttan devam ettirildi")
+                checkpoint.finish()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if checkpoint:
+            checkpoint.close()
+
+    results = {}
+    for match_key, _, _ in pairings:
+        if match_key in matches:
+            results[match_key] = matches[match_key].summary()
+            if match_key in stop_reasons:
+                results[match_key]['stop_reason'] = stop_reasons[match_key]
+            if 'paired' in results[match_key]:
+                print_paired(match_key, results[match_key]['paired'])
+    save_results(results, filename)
+    if spans is not None:
+        save_spans(spans, spans_filename)
     return results  # Sonuçları döndür
 
+def print_paired(match_key, paired):
+    """Eşli tahmini tek satırda yazdırır: kazanma oranı, güven aralığı, varyans azalması ve atış farkı"""
+    line = f"{match_key}: eşli kazanma oranı %{paired['win_rate']:.1f}"
+    if 'ci95' in paired:
+        low, high = paired['ci95']
+        line = f"{match_key}: çapraz kazanma oranı %{paired['crossed_win_rate']:.1f} [%{low:.1f}, %{high:.1f}]"
+        line += f", varyans {paired['variance_reduction']:.2f}x azaldı (~{paired['effective_games']:.0f} bağımsız oyun)"
+        low, high = paired['shot_margin_ci95']
+        line += f", atış farkı {paired['shot_margin']:+.1f} [{low:+.1f}, {high:+.1f}]"
+    print(f"{line} ({paired['pairs']} çift)")
+
 def save_results(results, filename='simulation_results.json'):
     """Simülasyon sonuçlarını JSON dosyasına kaydet"""
     # NumPy array'leri listeye çevir
@@ -148,10 +646,72 @@ def save_results(results, filename='simulation_results.json'):
         json.dump(serializable_results, f, indent=4)
     print(f"\nSonuçlar {filename} dosyasına kaydedildi.")
 
+def save_spans(spans, filename='simulation_spans.json'):
+    """Instruments ölçümlerini JSON dosyasına kaydet ve AI başına bölüm ortalamalarını yazdır"""
+    snapshot = spans.snapshot()
+    with open(filename, 'w') as f:
+        json.dump(snapshot, f, indent=4)
+    for ai_type, ai_spans in snapshot.items():
+        phases = ", ".join(f"{span} {data['mean_us']:.1f} µs" for span, data in ai_spans.items())
+        print(f"{ai_type}: {phases}")
+    print(f"Tur bölümü süreleri {filename} dosyasına kaydedildi.")
+
 def main():
+    parser = argparse.ArgumentParser(description="AI turnuva simülasyonu")
+    parser.add_argument('--games', type=int, default=100, help="eşleşme başına oyun sayısı")
+    parser.add_argument('--workers', type=int, default=None, help="işçi süreç sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument('--seed', type=int, default=0, help="turnuva tohumu")
+    parser.add_argument('--board-size', type=int, default=DEFAULT_RULES.size, help="tahtanın kenar uzunluğu")
+    parser.add_argument('--fleet', default=",".join(map(str, DEFAULT_RULES.fleet)),
+                        help="virgülle ayrılmış gemi boyları (ör. 5,4,3,3,2)")
+    parser.add_argument('--games-file', default='simulation_games.jsonl',
+                        help="oyun kayıtlarının satır satır eklendiği JSONL dosyası")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="oyun oynamadan --games-file içeriğinden özeti yeniden kur")
+    parser.add_argument('--resume', action='store_true',
+                        help="--games-file içindeki biten oyunları atla ve turnuvaya kaldığı yerden devam et")
+    parser.add_argument('--stop', choices=["sprt", "ci"], default=None,
+                        help="eşleşmeleri sıralı testle erken durdur (varsayılan: her eşleşme --games oyun)")
+    parser.add_argument('--batch-size', type=int, default=StopRule().batch_size,
+                        help="erken durdurmada tur başına eşleşme oyun sayısı")
+    parser.add_argument('--max-games', type=int, default=None, help="erken durdurmada eşleşme başına üst sınır")
+    parser.add_argument('--budget', type=int, default=None,
+                        help="erken durdurmada toplam oyun bütçesi (varsayılan: --games x eşleşme sayısı)")
+    parser.add_argument('--sprt-delta', type=float, default=StopRule().delta,
+                        help="SPRT hipotezleri: kazanma oranı 0.5 - delta ile 0.5 + delta")
+    parser.add_argument('--ci-width', type=float, default=StopRule().ci_width,
+                        help="ci yöntemi için hedef güven aralığı genişliği")
+    parser.add_argument('--spans', nargs='?', const='simulation_spans.json', default=None, metavar='SPANS_FILE',
+                        help="tur bölümlerini (decide, sample, score, render, apply) AI başına ölç ve dosyaya yaz "
+                             "(varsayılan: simulation_spans.json)")
+    parser.add_argument('--paired', action='store_true',
+                        help="eşli turnuva: her eşleşme ortak filo derleminde kenarları değiştirilmiş oyun çiftleri oynar")
+    args = parser.parse_args()
+
+    if args.aggregate:
+        save_results(aggregate_results(args.games_file))
+        return
+
+    try:
+        rules = Rules(args.board_size, [int(size) for size in args.fleet.split(",")])
+    except ValueError as error:
+        parser.error(str(error))
+    if args.paired and args.games % 2:
+        parser.error("--paired oyunları çift çift oynar; --games çift sayı olmalı")
+
+    stop_rule = None
+    if args.stop is not None:
+        stop_rule = StopRule(args.stop, args.batch_size, args.max_games, args.budget,
+                             delta=args.sprt_delta, ci_width=args.ci_width)
+
     print("Simülasyon başlıyor...")
-    results = run_simulation()  # Sonuçları al
-    save_results(results)  # Sonuçları kaydet
+    try:
+        run_simulation(num_games=args.games, workers=args.workers, seed=args.seed, rules=rules,
+                       games_filename=args.games_file, resume=args.resume, stop_rule=stop_rule,
+                       spans_filename=args.spans, paired=args.paired)
+    except KeyboardInterrupt:
+        print(f"\nDurduruldu. Biten oyunlar {args.games_file} dosyasında; devam etmek için --resume kullanın.")
+        return
     print("\nSimülasyon tamamlandı ve sonuçlar kaydedildi!")
 
 if __name__ == "__main__":
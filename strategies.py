@@ -0,0 +1,344 @@
+import bisect
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from board import iter_bits
+from geometry import (center_bonus, center_squares, neighbor_arrays, neighbor_counts, neighbor_table,
+                      parity_table)
+from instruments import clock
+from placements import mask_to_array, probability_density, random_placement
+
+# Bir AI kararı: seçilen (satır, sütun) ve kararın dayandığı size x size skor matrisi (yoksa None)
+Decision = namedtuple("Decision", ["move", "scores"])
+
+
+@lru_cache(maxsize=None)
+def greedy_base(size, parity_bonus=0.5):
+    """greedy_scores'un komşulardan bağımsız kısmı: merkez puanı + dama deseni bonusu"""
+    base = center_bonus(size) + parity_bonus * parity_table(size)
+    base.setflags(write=False)
+    return base
+
+
+def greedy_scores(board, size, hit_weight=3, miss_weight=-2, parity_bonus=0.5):
+    """Scores every cell of a search board at once; the shared greedy scoring kernel.
+
+    A cell scores ``(size - 1 - d) / 2`` for its Manhattan distance d to
+    the center, plus ``parity_bonus`` on the checkerboard cells where
+    row + col is even, plus the weights times its number of hit ("H") and
+    missed neighbours. Sunk cells count as neither. GreedyStrategy uses the
+    default weights; Game.evaluate_position uses 2, -1 and no parity bonus.
+    All terms are multiples of 0.5, so the sums are exact.
+    """
+    hits = neighbor_counts(mask_to_array(board.hits, size * size), size)
+    misses = neighbor_counts(mask_to_array(board.misses, size * size), size)
+    return greedy_base(size, parity_bonus) + hit_weight * hits + miss_weight * misses
+
+
+STRATEGIES = {}
+
+
+def register_strategy(name):
+    """Bir Strategy sınıfını verilen AI tipi adıyla kaydeden dekoratör"""
+    def decorator(cls):
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+
+def create_strategy(name, game, player, opponent):
+    """Kayıtlı stratejiyi oluşturur; bilinmeyen adlar random stratejiye düşer"""
+    return STRATEGIES.get(name, STRATEGIES["random"])(game, player, opponent)
+
+
+class Strategy:
+    """A per-game AI that keeps incremental state across turns.
+
+    The game calls ``observe`` after every shot the player makes, so
+    ``decide`` only pays for what changed since the last turn. The base
+    class tracks the open cells, the hit frontier (hits not yet part of a
+    sunk ship) and the sizes of the opponent's remaining ships. If the
+    board is edited behind the strategy's back, the next ``decide``
+    rebuilds the state from the board.
+    """
+
+    name = None
+
+    def __init__(self, game, player, opponent):
+        self.game = game
+        self.player = player
+        self.opponent = opponent
+        self.rules = game.rules
+        self.size = game.rules.size
+        self.neighbors = neighbor_table(self.size)
+        self.reset()
+
+    def reset(self):
+        """Tüm durumu oyuncunun search tahtasından yeniden kurar"""
+        board = self.player.search
+        self.open_cells = list(iter_bits(board.open))
+        self._position = {index: i for i, index in enumerate(self.open_cells)}
+        self.hits = list(iter_bits(board.hits))
+        self.remaining = [ship.size for ship in self.opponent.ships if ship.hits < ship.size]
+        self._seen = (board.hits, board.misses, board.sunk)
+
+    def observe(self, index, result, sunk_mask=0):
+        """Records the player's shot at ``index``: result is "H" or "M", sunk_mask the ship it sank"""
+        position = self._position.pop(index)
+        last = self.open_cells.pop()
+        if last != index:
+            self.open_cells[position] = last
+            self._position[last] = position
+
+        if result == "H":
+            bisect.insort(self.hits, index)
+        if sunk_mask:
+            self.hits = [i for i in self.hits if not sunk_mask >> i & 1]
+            self.remaining.remove(bin(sunk_mask).count("1"))
+
+        board = self.player.search
+        self._seen = (board.hits, board.misses, board.sunk)
+
+    def sync(self):
+        board = self.player.search
+        if self._seen != (board.hits, board.misses, board.sunk):
+            self.reset()
+
+    def decide(self):
+        raise NotImplementedError
+
+    def random_move(self):
+        if not self.open_cells:
+            return 0, 0
+        index = self.game.rng.choice(self.open_cells)
+        return divmod(index, self.size)
+
+    def frontier_move(self):
+        """Vurulan karelerin ilk boş komşusu (indeks sırasıyla), yoksa None"""
+        open_mask = self.player.search.open
+        for hit in self.hits:
+            for neighbor in self.neighbors[hit]:
+                if open_mask >> neighbor & 1:
+                    return divmod(neighbor, self.size)
+        return None
+
+
+@register_strategy("random")
+class RandomStrategy(Strategy):
+    def decide(self):
+        return Decision(self.random_move(), None)
+
+
+@register_strategy("bfs")
+class BfsStrategy(Strategy):
+    def decide(self):
+        # Vurulan karelerin etrafını ara
+        move = self.frontier_move()
+        if move is not None:
+            return Decision(move, None)
+
+        # Vurulan kare yoksa, merkeze yakın kareleri ara
+        squares = [i for i in center_squares(self.rules) if i in self._position]
+        if squares:
+            index = self.game.rng.choice(squares)
+            return Decision(divmod(index, self.size), None)
+
+        # Merkezde kare kalmadıysa, rastgele bir kare seç
+        return Decision(self.random_move(), None)
+
+
+@register_strategy("greedy")
+class GreedyStrategy(Strategy):
+    """Keeps a per-cell score table updated as neighbours are hit or missed"""
+
+    def reset(self):
+        super().reset()
+        board = self.player.search
+        self.scores = greedy_scores(board, self.size)
+        self._open = mask_to_array(board.open, board.num_cells)
+        self._neighbor_arrays = neighbor_arrays(self.size)
+
+    def observe(self, index, result, sunk_mask=0):
+        neighbors = self._neighbor_arrays[index]
+        if result == "H":
+            self.scores[neighbors] += 3
+        else:
+            self.scores[neighbors] -= 2
+        if sunk_mask:
+            # Batan geminin kareleri artık "H" değil, komşu bonusları geri alınır
+            for i in iter_bits(sunk_mask):
+                self.scores[self._neighbor_arrays[i]] -= 3
+        self._open[index] = False
+        super().observe(index, result, sunk_mask)
+
+    def decide(self):
+        size = self.size
+        if not self.open_cells:
+            return Decision((0, 0), np.full((size, size), -1.0))
+        spans = self.game.instruments
+        start = clock() if spans is not None else 0
+        scores = np.where(self._open, self.scores, -1.0)
+        best = int(np.argmax(np.where(self._open, self.scores, -np.inf)))
+        if spans is not None:
+            spans.record("score", start)
+        self.game.publish_scores(scores, self.player.search)
+        return Decision(divmod(best, size), scores.reshape(size, size))
+
+
+@register_strategy("monte_carlo")
+class MonteCarloStrategy(Strategy):
+    num_simulations = 100
+
+    def decide(self):
+        # 1. Vurulan karenin etrafını ara (BFS benzeri strateji)
+        move = self.frontier_move()
+        if move is not None:
+            return Decision(move, None)
+
+        size = self.size
+        search = self.player.search.tolist()
+
+        # 2. Monte Carlo simülasyonu için skor tablosu; vurulan, ıskalanan ve batık kareler -1
+        score_board = np.full(size * size, -1.0)
+        score_board[self.open_cells] = 0
+
+        # 3. Simülasyonlar
+        spans = self.game.instruments
+        start = clock() if spans is not None else 0
+        for _ in range(self.num_simulations):
+            temp_board = generate_simple_board(search, list(self.rules.fleet), size, self.game.rng)
+            score_board += np.where(score_board != -1, temp_board, 0)
+        if spans is not None:
+            spans.record("sample", start)
+            start = clock()
+
+        # 4. Vurulan karelerin etrafına bonus puan ver
+        for hit in self.hits:
+            for neighbor in self.neighbors[hit]:
+                if score_board[neighbor] != -1:
+                    score_board[neighbor] += 20
+
+        # 5. Merkeze yakın karelere bonus puan ver
+        open_mask = score_board != -1
+        score_board[open_mask] += 6 * center_bonus(size)[open_mask]
+
+        # 6. Vurulan karelerin etrafındaki karelerin etrafına da bonus puan ver
+        for hit in self.hits:
+            for neighbor in self.neighbors[hit]:
+                if score_board[neighbor] != -1:
+                    for second in self.neighbors[neighbor]:
+                        if score_board[second] != -1:
+                            score_board[second] += 10
+
+        score_board = score_board.reshape(size, size)
+        if spans is not None:
+            spans.record("score", start)
+
+        # 7. Skor matrisini dinleyicilere bildir (heatmap yalnızca istenirse çizilir)
+        self.game.publish_scores(score_board.flatten(), search)
+
+        # 8. En yüksek skorlu hücreyi seç
+        if score_board.max() > -1:
+            best = int(np.argmax(score_board))
+            return Decision(divmod(best, size), score_board)
+
+        # 9. Eğer en iyi hamle bulunamadıysa, merkeze yakın bir kare seç
+        squares = [i for i in center_squares(self.rules) if i in self._position]
+        if squares:
+            index = self.game.rng.choice(squares)
+            return Decision(divmod(index, size), score_board)
+        return Decision(self.random_move(), score_board)
+
+
+@register_strategy("probability")
+class ProbabilityStrategy(Strategy):
+    def decide(self):
+        spans = self.game.instruments
+        start = clock() if spans is not None else 0
+        density = probability_density(self.player.search, self.remaining, self.size)
+        if spans is not None:
+            spans.record("score", start)
+        self.game.publish_scores(density.flatten(), self.player.search)
+
+        if density.max() > 0:
+            best = int(np.argmax(density))
+            return Decision(divmod(best, self.size), density)
+
+        # Tutarlı yerleşim kalmadıysa rastgele boş bir kare seç
+        return Decision(self.random_move(), density)
+
+
+def generate_simple_board(known_board, ship_sizes, board_size=10, rng=random):
+    """Basitleştirilmiş gemi yerleştirme stratejisi; rastgele yerleşimler ``rng``'den çekilir"""
+    board = [0 for _ in range(board_size * board_size)]
+
+    # Vurulan kareleri bul
+    hit_squares = [divmod(i, board_size) for i, val in enumerate(known_board) if val == "H"]
+
+    # Vurulan kareleri kapsayan gemileri yerleştir
+    for hit in hit_squares:
+        hit_covered = False
+        for size in ship_sizes[:]:  # Liste kopyası kullan
+            if hit_covered:
+                break
+
+            # Yatay ve dikey yerleşimleri dene
+            for orientation in ["h", "v"]:
+                if hit_covered:
+                    break
+
+                # Gemi başlangıç pozisyonunu hesapla
+                if orientation == "h":
+                    start_col = max(0, hit[1] - size + 1)
+                    start_row = hit[0]
+                else:
+                    start_row = max(0, hit[0] - size + 1)
+                    start_col = hit[1]
+
+                # Gemi yerleştirme kontrolü
+                valid = True
+                indexes = []
+
+                for i in range(size):
+                    r = start_row + (i if orientation == "v" else 0)
+                    c = start_col + (i if orientation == "h" else 0)
+
+                    if r >= board_size or c >= board_size:
+                        valid = False
+                        break
+
+                    idx = r * board_size + c
+                    if known_board[idx] in ["M", "S"] or board[idx] == 1:
+                        valid = False
+                        break
+
+                    indexes.append((r, c))
+
+                if valid and hit in indexes:
+                    for r, c in indexes:
+                        board[r * board_size + c] = 1
+                    hit_covered = True
+                    ship_sizes.remove(size)
+                    break
+
+    # Kalan gemileri yerleştir: tutarlı yerleşimler tablodan düzgün seçilir, deneme döngüsü yok
+    occupied = 0
+    for i, val in enumerate(known_board):
+        if val in ("M", "S") or board[i] == 1:
+            occupied |= 1 << i
+
+    remaining_ships = ship_sizes.copy()
+    for size in remaining_ships:
+        placement = random_placement(size, occupied, rng, board_size)
+        if placement is None:
+            continue  # Yer kalmadıysa gemi atlanır
+        for idx in placement[3]:
+            board[idx] = 1
+        occupied |= placement[4]
+        ship_sizes.remove(size)
+
+    return board